@@ -15,3 +15,8 @@ CREATE TABLE IF NOT EXISTS canonical_facts (
     source_context_ref TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
+
+CREATE INDEX IF NOT EXISTS idx_cf_ticker_period
+    ON canonical_facts (ticker, period_end DESC, statement, line_item)
+    INCLUDE (value, unit)
+    WHERE period_end IS NOT NULL;
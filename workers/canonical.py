@@ -1,11 +1,16 @@
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .db import ensure_schema, get_conn
 from .tag_map import allowed_line_items, allowed_statements
 
-ALLOWED_STATEMENTS = allowed_statements()
+ALLOWED_STATEMENTS = frozenset(allowed_statements())
 ALLOWED_LINE_ITEMS = allowed_line_items()
+# Flattened (statement, line_item) whitelist: one hash probe per row instead of two lookups and a call.
+_ALLOWED_PAIRS = frozenset(
+    (statement, line_item) for statement in ALLOWED_STATEMENTS for line_item in ALLOWED_LINE_ITEMS.get(statement, ())
+)
 import os
 
 def _env_float(name: str, default: float) -> float:
@@ -22,12 +27,7 @@ logger = logging.getLogger(__name__)
 
 
 def is_allowed(statement: Optional[str], line_item: Optional[str]) -> bool:
-    if not statement or not line_item:
-        return False
-    if statement not in ALLOWED_STATEMENTS:
-        return False
-    allowed = ALLOWED_LINE_ITEMS.get(statement, set())
-    return line_item in allowed
+    return (statement, line_item) in _ALLOWED_PAIRS
 
 
 def _normalize_period_type(statement: Optional[str], period_type: Optional[str]) -> str:
@@ -38,6 +38,8 @@ def _normalize_period_type(statement: Optional[str], period_type: Optional[str])
     return period_type or "unknown"
 
 
+# Units come from a handful of distinct strings, so normalized results are memoized across rows and calls.
+@lru_cache(maxsize=256)
 def _normalize_unit(unit: Optional[str]) -> str:
     if not unit:
         return "USD"
@@ -47,6 +49,24 @@ def _normalize_unit(unit: Optional[str]) -> str:
     return cleaned
 
 
+# Field order of the record tuples consumed by _aggregate_records.
+_ROW_FIELDS = (
+    "id",
+    "ticker",
+    "cik",
+    "accession",
+    "period_start",
+    "period_end",
+    "period_type",
+    "statement",
+    "line_item",
+    "value",
+    "unit",
+    "xbrl_tag",
+    "context_ref",
+)
+
+
 def aggregate_canonical_rows(rows: Iterable[Dict[str, Any]], default_period_end: Optional[Any] = None) -> List[Dict[str, Any]]:
     """
     Pure helper to aggregate fact rows by period/tag/unit.
@@ -57,34 +77,53 @@ def aggregate_canonical_rows(rows: Iterable[Dict[str, Any]], default_period_end:
     - Prefers facts from the latest accession when duplicates exist.
     - Computes basic tie checks (A=L+E, CFO/CFI/CFF sum) per period for downstream reporting.
     """
-    def duration_days(start, end) -> Optional[int]:
-        if start is None or end is None:
-            return None
-        try:
-            return (end - start).days
-        except Exception:
-            return None
+    records = (tuple(map(row.get, _ROW_FIELDS)) for row in rows)
+    return _aggregate_records(records, default_period_end)
 
-    aggregated: Dict[Tuple[Any, Any, Any, str, str, str, str], Dict[str, Any]] = {}
-    for row in rows:
-        value = row.get("value")
-        statement = row.get("statement")
-        line_item = row.get("line_item")
-        if not is_allowed(statement, line_item):
+
+@lru_cache(maxsize=4096)
+def _duration_days(start: Any, end: Any) -> Optional[int]:
+    """Span in days, or None when either bound is missing or not date-like (e.g. ISO strings)."""
+    if start is None or end is None:
+        return None
+    try:
+        return (end - start).days
+    except Exception:
+        return None
+
+
+def _aggregate_records(records: Iterable[Tuple[Any, ...]], default_period_end: Optional[Any]) -> List[Dict[str, Any]]:
+    aggregated: Dict[Tuple[Any, Any, Any, str, str, str], Dict[str, Any]] = {}
+    # Duration of each group's current winner, filled on first collision and kept in step with the winner,
+    # so repeated duplicates compare against a cached value instead of re-deriving it from dates.
+    winner_durations: Dict[Tuple[Any, Any, Any, str, str, str], Optional[int]] = {}
+    for (
+        source_id,
+        raw_ticker,
+        cik,
+        accession,
+        period_start,
+        raw_period_end,
+        raw_period_type,
+        statement,
+        line_item,
+        value,
+        raw_unit,
+        xbrl_tag,
+        context_ref,
+    ) in records:
+        if (statement, line_item) not in _ALLOWED_PAIRS:
             continue
-        period_end = row.get("period_end") or default_period_end
-        period_start = row.get("period_start")
+        period_end = raw_period_end or default_period_end
         if value is None or not statement or not line_item or period_end is None:
             continue
-        ticker = (row.get("ticker") or "").upper()
-        cik = row.get("cik")
-        accession = row.get("accession")
-        period_type = _normalize_period_type(statement, row.get("period_type"))
-        unit = _normalize_unit(row.get("unit"))
-        key = (ticker, cik, period_end, period_type, statement, line_item, unit)
+        ticker = (raw_ticker or "").upper()
+        period_type = _normalize_period_type(statement, raw_period_type)
+        unit = _normalize_unit(raw_unit)
+        # period_type is a function of statement for every allowed statement, so it is left out of the group key.
+        key = (ticker, cik, period_end, statement, line_item, unit)
         existing = aggregated.get(key)
         numeric_value = float(value)
-        source_id = row.get("id")
         if not existing:
             aggregated[key] = {
                 "ticker": ticker,
@@ -98,24 +137,27 @@ def aggregate_canonical_rows(rows: Iterable[Dict[str, Any]], default_period_end:
                 "value": numeric_value,
                 "unit": unit,
                 "source_fact_id": source_id,
-                "source_xbrl_tag": row.get("xbrl_tag"),
-                "source_context_ref": row.get("context_ref"),
+                "source_xbrl_tag": xbrl_tag,
+                "source_context_ref": context_ref,
             }
             continue
         choose_current = False
         existing_accession = existing.get("accession")
-        if accession and existing_accession:
-            if accession > existing_accession:
+        # Duplicates usually come from the same filing; an identical accession skips straight to the tie-break.
+        if accession != existing_accession:
+            if accession and existing_accession:
+                if accession > existing_accession:
+                    choose_current = True
+                else:
+                    continue
+            elif accession:
                 choose_current = True
-            elif accession < existing_accession:
+            elif existing_accession:
                 continue
-        elif accession and not existing_accession:
-            choose_current = True
-        elif existing_accession and not accession:
-            continue
 
         current_value = existing.get("value")
         if choose_current:
+            winner_durations.pop(key, None)
             aggregated[key] = {
                 "ticker": ticker,
                 "cik": cik,
@@ -127,14 +169,19 @@ def aggregate_canonical_rows(rows: Iterable[Dict[str, Any]], default_period_end:
                 "value": numeric_value,
                 "unit": unit,
                 "source_fact_id": source_id,
-                "source_xbrl_tag": row.get("xbrl_tag"),
-                "source_context_ref": row.get("context_ref"),
+                "source_xbrl_tag": xbrl_tag,
+                "source_context_ref": context_ref,
             }
         else:
             if statement in ("cash_flow", "income_statement"):
                 # Prefer the shortest duration (closest start to end) when period_start present.
-                current_duration = duration_days(existing.get("period_start"), existing.get("period_end"))
-                new_duration = duration_days(period_start, period_end)
+                if key in winner_durations:
+                    current_duration = winner_durations[key]
+                else:
+                    current_duration = winner_durations[key] = _duration_days(
+                        existing.get("period_start"), existing.get("period_end")
+                    )
+                new_duration = _duration_days(period_start, period_end)
                 choose_new = False
                 if current_duration is None and new_duration is not None:
                     choose_new = True
@@ -149,16 +196,17 @@ def aggregate_canonical_rows(rows: Iterable[Dict[str, Any]], default_period_end:
                             choose_new = True
 
                 if choose_new:
-                    existing.update(
-                        {
-                            "value": numeric_value,
-                            "accession": accession if accession else existing.get("accession"),
-                            "period_start": period_start or existing.get("period_start"),
-                            "source_fact_id": source_id if source_id is not None else existing.get("source_fact_id"),
-                            "source_xbrl_tag": row.get("xbrl_tag") or existing.get("source_xbrl_tag"),
-                            "source_context_ref": row.get("context_ref") or existing.get("source_context_ref"),
-                        }
-                    )
+                    existing["value"] = numeric_value
+                    if accession:
+                        existing["accession"] = accession
+                    existing["period_start"] = period_start or existing.get("period_start")
+                    if source_id is not None:
+                        existing["source_fact_id"] = source_id
+                    if xbrl_tag:
+                        existing["source_xbrl_tag"] = xbrl_tag
+                    if context_ref:
+                        existing["source_context_ref"] = context_ref
+                    winner_durations[key] = _duration_days(existing.get("period_start"), period_end)
             else:
                 # For income statement and balance sheet, keep the larger magnitude (default behavior).
                 if current_value is None or abs(numeric_value) > abs(float(current_value)):
@@ -166,12 +214,28 @@ def aggregate_canonical_rows(rows: Iterable[Dict[str, Any]], default_period_end:
                     if accession and not existing.get("accession"):
                         existing["accession"] = accession
                     existing["source_fact_id"] = source_id if source_id is not None else existing.get("source_fact_id")
-                    existing["source_xbrl_tag"] = row.get("xbrl_tag") or existing.get("source_xbrl_tag")
-                    existing["source_context_ref"] = row.get("context_ref") or existing.get("source_context_ref")
-    return [aggregated[k] for k in sorted(aggregated.keys(), key=lambda x: (x[2], x[4], x[5]))]
+                    existing["source_xbrl_tag"] = xbrl_tag or existing.get("source_xbrl_tag")
+                    existing["source_context_ref"] = context_ref or existing.get("source_context_ref")
+    return [aggregated[k] for k in sorted(aggregated.keys(), key=lambda x: (x[2], x[3], x[4]))]
+
 
+def _row_order(row: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    return (row.get("period_end"), row.get("statement"), row.get("line_item"))
 
-def _add_balance_sheet_residuals(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def enrich_canonical_rows(rows: List[Dict[str, Any]], fact_rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Align cash flow starts and add every derived line item, sorting the combined rows once at the end.
+    Each pass groups rows by period itself, so skipping the intermediate sorts does not change what is derived.
+    """
+    rows = _align_cash_flow_starts(rows, fact_rows)
+    rows = _add_balance_sheet_residuals(rows, sort=False)
+    rows = _add_income_statement_derivations(rows, sort=False)
+    rows = _add_cash_flow_residuals(rows, sort=False)
+    return sorted(rows, key=_row_order)
+
+
+def _add_balance_sheet_residuals(rows: List[Dict[str, Any]], sort: bool = True) -> List[Dict[str, Any]]:
     """
     Add residual balance sheet line items when totals exist but components are missing.
     """
@@ -186,8 +250,7 @@ def _add_balance_sheet_residuals(rows: List[Dict[str, Any]]) -> List[Dict[str, A
 
     derived = []
 
-    def _residual(total_item: str, component_items: list[str], derived_item: str, period_rows: list[Dict[str, Any]]) -> None:
-        line_map = {r.get("line_item"): r for r in period_rows}
+    def _residual(total_item: str, component_items: list[str], derived_item: str, line_map: Dict[str, Dict[str, Any]]) -> None:
         if derived_item in line_map:
             return
         total_row = line_map.get(total_item)
@@ -228,19 +291,20 @@ def _add_balance_sheet_residuals(rows: List[Dict[str, Any]]) -> List[Dict[str, A
         )
 
     for period, period_rows in by_period.items():
+        # One line-item map per period, shared by every residual below (derived rows are kept separately).
+        line_map = {r.get("line_item"): r for r in period_rows}
         _residual(
             "assets_current",
             ["cash", "short_term_investments", "accounts_receivable", "inventory", "prepaid_expenses"],
             "other_assets_current",
-            period_rows,
+            line_map,
         )
         _residual(
             "assets_noncurrent",
             ["ppe", "goodwill", "intangible_assets"],
             "other_assets_noncurrent",
-            period_rows,
+            line_map,
         )
-        line_map = {r.get("line_item"): r for r in period_rows}
         liabilities_equity = line_map.get("liabilities_equity")
         equity = line_map.get("equity")
         if "liabilities" not in line_map and liabilities_equity and equity:
@@ -267,22 +331,22 @@ def _add_balance_sheet_residuals(rows: List[Dict[str, Any]]) -> List[Dict[str, A
             "liabilities_current",
             ["accounts_payable", "accrued_expenses", "deferred_revenue_current", "debt_current"],
             "other_liabilities_current",
-            period_rows,
+            line_map,
         )
         _residual(
             "liabilities_noncurrent",
             ["deferred_revenue_noncurrent", "debt_long_term", "minority_interest"],
             "other_liabilities_noncurrent",
-            period_rows,
+            line_map,
         )
 
     if not derived:
         return rows
     combined = rows + derived
-    return sorted(combined, key=lambda x: (x.get("period_end"), x.get("statement"), x.get("line_item")))
+    return sorted(combined, key=_row_order) if sort else combined
 
 
-def _add_income_statement_derivations(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _add_income_statement_derivations(rows: List[Dict[str, Any]], sort: bool = True) -> List[Dict[str, Any]]:
     """
     Add derived income statement line items when component facts are present.
     """
@@ -312,17 +376,26 @@ def _add_income_statement_derivations(rows: List[Dict[str, Any]]) -> List[Dict[s
         derived.append(row)
         return row
 
-    for period_rows in by_period.values():
-        line_map = {r.get("line_item"): r for r in period_rows if r.get("statement") == "income_statement"}
-        cash_map = {r.get("line_item"): r for r in period_rows if r.get("statement") == "cash_flow"}
+    def _value(row: Optional[Dict[str, Any]], unit: Optional[str]) -> Optional[float]:
+        if not row:
+            return None
+        if unit and row.get("unit") and row.get("unit") != unit:
+            return None
+        val = row.get("value")
+        return float(val) if val is not None else None
 
-        def _value(row: Optional[Dict[str, Any]], unit: Optional[str]) -> Optional[float]:
-            if not row:
-                return None
-            if unit and row.get("unit") and row.get("unit") != unit:
-                return None
-            val = row.get("value")
-            return float(val) if val is not None else None
+    for period_rows in by_period.values():
+        line_map: Dict[Any, Dict[str, Any]] = {}
+        cash_map: Dict[Any, Dict[str, Any]] = {}
+        for r in period_rows:
+            statement = r.get("statement")
+            if statement == "income_statement":
+                line_map[r.get("line_item")] = r
+            elif statement == "cash_flow":
+                cash_map[r.get("line_item")] = r
+        # Every derivation below needs at least one income statement input.
+        if not line_map:
+            continue
 
         revenue = line_map.get("revenue")
         gross_profit = line_map.get("gross_profit")
@@ -383,7 +456,7 @@ def _add_income_statement_derivations(rows: List[Dict[str, Any]]) -> List[Dict[s
     if not derived:
         return rows
     combined = rows + derived
-    return sorted(combined, key=lambda x: (x.get("period_end"), x.get("statement"), x.get("line_item")))
+    return sorted(combined, key=_row_order) if sort else combined
 
 
 def _align_cash_flow_starts(
@@ -405,14 +478,16 @@ def _align_cash_flow_starts(
             continue
         by_period_unit.setdefault((period_end, unit), {})[row.get("line_item")] = row
 
-    align_items = {
+    # Tuple, not set: new rows are appended in this order, so it must not depend on string hashing.
+    align_items = (
         "cfi",
         "cff",
         "change_in_cash",
         "fx_on_cash",
         "change_in_restricted_cash",
-    }
-    candidates: Dict[Tuple[Any, str, str], List[Dict[str, Any]]] = {}
+    )
+    # Bucket candidate facts by their start too, so matching a CFO anchor is one lookup instead of a rescan.
+    candidates: Dict[Tuple[Any, str, str, Any], List[Dict[str, Any]]] = {}
     for fact in fact_rows:
         if fact.get("statement") != "cash_flow":
             continue
@@ -422,7 +497,7 @@ def _align_cash_flow_starts(
         if fact.get("value") is None or fact.get("period_end") is None:
             continue
         unit = _normalize_unit(fact.get("unit"))
-        key = (fact.get("period_end"), unit, line_item)
+        key = (fact.get("period_end"), unit, line_item, fact.get("period_start"))
         candidates.setdefault(key, []).append(fact)
 
     for key, line_map in by_period_unit.items():
@@ -434,10 +509,7 @@ def _align_cash_flow_starts(
             continue
         period_end, unit = key
         for line_item in align_items:
-            item_candidates = candidates.get((period_end, unit, line_item), [])
-            if not item_candidates:
-                continue
-            matching = [row for row in item_candidates if row.get("period_start") == anchor_start]
+            matching = candidates.get((period_end, unit, line_item, anchor_start))
             if not matching:
                 continue
             selected = max(
@@ -475,7 +547,7 @@ def _align_cash_flow_starts(
     return rows
 
 
-def _add_cash_flow_residuals(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _add_cash_flow_residuals(rows: List[Dict[str, Any]], sort: bool = True) -> List[Dict[str, Any]]:
     """
     Add derived cash flow line items from statement totals when missing.
     """
@@ -583,7 +655,7 @@ def _add_cash_flow_residuals(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     if not derived:
         return rows
     combined = rows + derived
-    return sorted(combined, key=lambda x: (x.get("period_end"), x.get("statement"), x.get("line_item")))
+    return sorted(combined, key=_row_order) if sort else combined
 
 
 def _collect_tie_violations(aggregated: List[Dict[str, Any]], tolerance: Optional[float] = None) -> List[str]:
@@ -712,10 +784,7 @@ def materialize_canonical_for_ticker(ticker: str, strict_ties: Optional[bool] =
                 aggregated = aggregate_canonical_rows(fact_rows, default_period_end=default_period_end)
 
             if aggregated:
-                aggregated = _align_cash_flow_starts(aggregated, fact_rows)
-                aggregated = _add_balance_sheet_residuals(aggregated)
-                aggregated = _add_income_statement_derivations(aggregated)
-                aggregated = _add_cash_flow_residuals(aggregated)
+                aggregated = enrich_canonical_rows(aggregated, fact_rows)
                 insert_sql = """
                 INSERT INTO canonical_facts (
                     ticker,
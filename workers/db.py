@@ -78,6 +78,15 @@ def ensure_schema() -> None:
             cur.execute("ALTER TABLE canonical_facts ADD COLUMN IF NOT EXISTS period_start DATE;")
             cur.execute("ALTER TABLE canonical_facts ADD COLUMN IF NOT EXISTS source_xbrl_tag TEXT;")
             cur.execute("ALTER TABLE canonical_facts ADD COLUMN IF NOT EXISTS source_context_ref TEXT;")
+            # Covers build_statements: ticker filter, period_end DESC order, and the selected columns.
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_cf_ticker_period
+                ON canonical_facts (ticker, period_end DESC, statement, line_item)
+                INCLUDE (value, unit)
+                WHERE period_end IS NOT NULL;
+                """
+            )
         conn.commit()
 
 
@@ -1,6 +1,9 @@
 import argparse
 import logging
-from typing import Any, Dict, List, Optional
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from .backfill_ticker import backfill_ticker
 from ..ticker_map import list_supported_tickers
@@ -8,13 +11,26 @@ from ..ticker_map import list_supported_tickers
 logger = logging.getLogger(__name__)
 
 
+def _backfill_one(
+    ticker: str, limit: int, storage_root: Optional[str], strict_ties: bool
+) -> Tuple[Dict[str, Any], bool]:
+    """Run one ticker's backfill, returning (result, failed) so errors never escape a pool worker."""
+    try:
+        return backfill_ticker(ticker, limit=limit, storage_root=storage_root, strict_ties=strict_ties), False
+    except Exception as exc:  # pragma: no cover - guarded by runtime logs
+        logger.exception("Backfill failed for %s: %s", ticker, exc)
+        return {"ticker": ticker, "error": str(exc)}, True
+
+
 def backfill_all(
     limit: int = 8,
     max_tickers: Optional[int] = None,
     tickers: Optional[List[str]] = None,
     storage_root: Optional[str] = None,
     strict_ties: bool = True,
+    workers: Optional[int] = 1,
 ) -> Dict[str, Any]:
+    """Backfill each selected ticker; ``workers`` > 1 (or None for one per CPU) runs tickers in parallel."""
     if tickers:
         selected = [t.strip().upper() for t in tickers if t.strip()]
     else:
@@ -23,18 +39,21 @@ def backfill_all(
     if max_tickers is not None:
         selected = selected[: max_tickers]
 
-    results = []
-    failures = 0
-    for ticker in selected:
-        try:
-            result = backfill_ticker(
-                ticker, limit=limit, storage_root=storage_root, strict_ties=strict_ties
-            )
-            results.append(result)
-        except Exception as exc:  # pragma: no cover - guarded by runtime logs
-            logger.exception("Backfill failed for %s: %s", ticker, exc)
-            failures += 1
-            results.append({"ticker": ticker, "error": str(exc)})
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(selected) > 1:
+        # Tickers are independent, so spread them over processes; spawn gives each worker its own DB connections.
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(selected)), mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = [
+                pool.submit(_backfill_one, ticker, limit, storage_root, strict_ties) for ticker in selected
+            ]
+            outcomes = [future.result() for future in futures]
+    else:
+        outcomes = [_backfill_one(ticker, limit, storage_root, strict_ties) for ticker in selected]
+    results = [result for result, _ in outcomes]
+    failures = sum(1 for _, failed in outcomes if failed)
 
     return {
         "tickers": selected,
@@ -61,6 +80,12 @@ def _parse_args() -> argparse.Namespace:
         default=False,
         help="Fail backfill if tie checks do not pass.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of tickers to backfill in parallel processes (0 = one per CPU).",
+    )
     return parser.parse_args()
 
 
@@ -72,6 +97,7 @@ def _main() -> None:
         max_tickers=args.max_tickers,
         tickers=tickers,
         strict_ties=args.strict_ties,
+        workers=args.workers or None,
     )
     logger.info(
         "Backfill complete: %d success, %d failed (limit=%d)",
@@ -1,10 +1,15 @@
+import io
 import logging
+import mmap
 import os
 import re
+import sys
 from datetime import date, datetime
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import IO, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
 
 from bs4 import BeautifulSoup
+from lxml import etree
 
 from .db import ensure_schema, get_conn
 from .canonical import is_allowed
@@ -12,33 +17,61 @@ from .tag_map import TAG_MAP
 
 logger = logging.getLogger(__name__)
 
-ALLOWED_CONTEXT_AXES = {
-    "us-gaap:StatementClassOfStockAxis",
-    "us-gaap:StatementEquityComponentsAxis",
-    "dei:LegalEntityAxis",
-    "srt:ConsolidationItemsAxis",
-}
-ALLOWED_AXIS_MEMBERS = {
-    "srt:ConsolidationItemsAxis": {
-        "us-gaap:CorporateNonSegmentMember",
-        "us-gaap:ConsolidatedEntitiesMember",
-        "us-gaap:ConsolidatedEntityMember",
-        "srt:ConsolidatedGroupMember",
-    },
-    "us-gaap:StatementClassOfStockAxis": {"us-gaap:CommonStockMember"},
-    "us-gaap:StatementEquityComponentsAxis": {
-        "us-gaap:AccumulatedOtherComprehensiveIncomeMember",
-        "us-gaap:CommonStockMember",
-        "us-gaap:CommonStockIncludingAdditionalPaidInCapitalMember",
-        "us-gaap:RetainedEarningsMember",
-        "us-gaap:TreasuryStockMember",
-    },
+ALLOWED_CONTEXT_AXES = frozenset(
+    {
+        "us-gaap:StatementClassOfStockAxis",
+        "us-gaap:StatementEquityComponentsAxis",
+        "dei:LegalEntityAxis",
+        "srt:ConsolidationItemsAxis",
+    }
+)
+ALLOWED_AXIS_MEMBERS: Dict[str, FrozenSet[str]] = {
+    "srt:ConsolidationItemsAxis": frozenset(
+        {
+            "us-gaap:CorporateNonSegmentMember",
+            "us-gaap:ConsolidatedEntitiesMember",
+            "us-gaap:ConsolidatedEntityMember",
+            "srt:ConsolidatedGroupMember",
+        }
+    ),
+    "us-gaap:StatementClassOfStockAxis": frozenset({"us-gaap:CommonStockMember"}),
+    "us-gaap:StatementEquityComponentsAxis": frozenset(
+        {
+            "us-gaap:AccumulatedOtherComprehensiveIncomeMember",
+            "us-gaap:CommonStockMember",
+            "us-gaap:CommonStockIncludingAdditionalPaidInCapitalMember",
+            "us-gaap:RetainedEarningsMember",
+            "us-gaap:TreasuryStockMember",
+        }
+    ),
 }
-ANCHOR_LINE_ITEMS = {
-    "income_statement": {"revenue", "net_income", "gross_profit", "operating_income"},
-    "balance_sheet": {"assets", "equity", "liabilities_equity", "cash"},
-    "cash_flow": {"cfo", "cfi", "cff", "net_income"},
+ANCHOR_LINE_ITEMS: Dict[str, FrozenSet[str]] = {
+    "income_statement": frozenset({"revenue", "net_income", "gross_profit", "operating_income"}),
+    "balance_sheet": frozenset({"assets", "equity", "liabilities_equity", "cash"}),
+    "cash_flow": frozenset({"cfo", "cfi", "cff", "net_income"}),
 }
+# Axis/member pairs resolved once so each context dimension costs a single set lookup.
+_ALLOWED_DIMENSIONS: FrozenSet[Tuple[str, str]] = frozenset(
+    (axis, member) for axis, members in ALLOWED_AXIS_MEMBERS.items() for member in members
+)
+_UNRESTRICTED_AXES: FrozenSet[str] = ALLOWED_CONTEXT_AXES - ALLOWED_AXIS_MEMBERS.keys()
+# Shared miss value so lookups in the fact loops never allocate an empty set.
+_EMPTY_FS: FrozenSet[str] = frozenset()
+
+
+def _normalize_tag_map() -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Flatten TAG_MAP entries to tuples of allowed (line_item, statement) pairs."""
+    normalized: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+    for tag, entry in TAG_MAP.items():
+        mappings = entry if isinstance(entry, list) else [entry]
+        allowed = tuple((line_item, statement) for line_item, statement in mappings if is_allowed(statement, line_item))
+        if allowed:
+            normalized[tag] = allowed
+    return normalized
+
+
+# Disallowed pairs are dropped here once, so parsed facts never need re-checking downstream.
+_TAG_MAPPINGS = _normalize_tag_map()
 
 
 def _parse_amount(text: str) -> Optional[float]:
@@ -51,18 +84,6 @@ def _parse_amount(text: str) -> Optional[float]:
         return None
 
 
-def _apply_decimals(value: Optional[float], decimals: Optional[str]) -> Optional[float]:
-    if value is None or decimals is None:
-        return value
-    if decimals in {"INF", "inf"}:
-        return value
-    try:
-        d = int(decimals)
-        return value  # decimals indicate precision, not scale; leave as-is.
-    except ValueError:
-        return value
-
-
 def _apply_scale(value: Optional[float], scale: Optional[str]) -> Optional[float]:
     if value is None or scale is None:
         return value
@@ -121,23 +142,6 @@ def _duration_days(start: Optional[str], end: Optional[str]) -> Optional[int]:
     return (end_date - start_date).days
 
 
-def _extract_document_metadata(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
-    period_focus = None
-    document_type = None
-    for tag in soup.find_all():
-        name = tag.get("name")
-        if not name:
-            continue
-        lowered = name.lower()
-        if lowered == "dei:documentfiscalperiodfocus":
-            period_focus = tag.get_text(strip=True)
-        elif lowered == "dei:documenttype":
-            document_type = tag.get_text(strip=True)
-        if period_focus and document_type:
-            break
-    return period_focus, document_type
-
-
 def _infer_granularity(period_focus: Optional[str], document_type: Optional[str]) -> str:
     if document_type:
         doc = document_type.strip().upper()
@@ -187,43 +191,8 @@ def _select_preferred_duration(durations: List[int], granularity: str) -> Option
     return _pick_duration(durations, prefer_shorter=True)
 
 
-def _context_is_allowed(dimensions: List[Tuple[str, str]]) -> bool:
-    if not dimensions:
-        return True
-    for axis, member in dimensions:
-        if axis not in ALLOWED_CONTEXT_AXES:
-            return False
-        allowed_members = ALLOWED_AXIS_MEMBERS.get(axis)
-        if allowed_members and member not in allowed_members:
-            return False
-    return True
-
-
-def _build_unit_map(soup: BeautifulSoup) -> Dict[str, str]:
-    unit_map: Dict[str, str] = {}
-    for unit in soup.find_all(lambda t: t.name and t.name.lower().endswith("unit")):
-        unit_id = unit.get("id")
-        if not unit_id:
-            continue
-        divide = unit.find(lambda t: t.name and t.name.lower().endswith("divide"))
-        if divide:
-            numerator = divide.find(lambda t: t.name and t.name.lower().endswith("unitnumerator"))
-            denominator = divide.find(lambda t: t.name and t.name.lower().endswith("unitdenominator"))
-            num_measure = numerator.find(lambda t: t.name and t.name.lower().endswith("measure")) if numerator else None
-            den_measure = denominator.find(lambda t: t.name and t.name.lower().endswith("measure")) if denominator else None
-            num_unit = _normalize_unit(num_measure.get_text(strip=True) if num_measure else None)
-            den_unit = _normalize_unit(den_measure.get_text(strip=True) if den_measure else None)
-            if num_unit == "USD" and den_unit == "SHARES":
-                unit_map[unit_id] = "USDPERSHARE"
-            elif num_unit and den_unit:
-                unit_map[unit_id] = f"{num_unit}/{den_unit}"
-            else:
-                unit_map[unit_id] = _normalize_unit(unit_id)
-            continue
-        measure = unit.find(lambda t: t.name and t.name.lower().endswith("measure"))
-        if measure:
-            unit_map[unit_id] = _normalize_unit(measure.get_text(strip=True))
-    return unit_map
+def _dimension_is_allowed(axis: str, member: str) -> bool:
+    return (axis, member) in _ALLOWED_DIMENSIONS or axis in _UNRESTRICTED_AXES
 
 
 def parse_simple_table(html_content: bytes) -> List[Dict[str, Optional[str]]]:
@@ -245,44 +214,36 @@ def parse_simple_table(html_content: bytes) -> List[Dict[str, Optional[str]]]:
                 continue
             row_map = dict(zip(headers, cells))
             results.append(row_map)
-def parse_inline_xbrl(html_content: bytes) -> List[Dict[str, Optional[str]]]:
-    """Extract a small set of inline XBRL facts by tag name, including period info."""
-    soup = BeautifulSoup(html_content, "html.parser")
-    unit_map = _build_unit_map(soup)
-    period_focus, document_type = _extract_document_metadata(soup)
-    granularity = _infer_granularity(period_focus, document_type)
 
-    # Build context map to resolve period_end and type.
+
+# A context reduced to (id, start, end, instant) once its dimensions have passed the allowlist.
+_RawContext = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+class _RawFact(NamedTuple):
+    name: str
+    mappings: Tuple[Tuple[str, str], ...]
+    text: str
+    scale: Optional[str]
+    sign: Optional[str]
+    context_ref: Optional[str]
+    unit_ref: str
+
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _build_context_map(
+    raw_contexts: List[_RawContext],
+) -> Tuple[Dict[str, Dict[str, Optional[str]]], Optional[str], Optional[str]]:
+    """Resolve period_end/type per context, plus the fallback period used by context-less facts."""
     contexts: Dict[str, Dict[str, Optional[str]]] = {}
     fallback_period_end: Optional[str] = None
     fallback_period_type: Optional[str] = None
-    for ctx in soup.find_all(True):
-        if not ctx.name or not ctx.name.lower().endswith("context"):
-            continue
-        ctx_id = ctx.get("id")
-        if not ctx_id:
-            continue
-        segment = ctx.find(lambda t: t.name and t.name.lower().endswith("segment"))
-        if segment:
-            if segment.find(lambda t: t.name and t.name.lower().endswith("typedmember")):
-                continue
-            dims = []
-            for member in segment.find_all(lambda t: t.name and t.name.lower().endswith("explicitmember")):
-                axis = member.get("dimension")
-                member_value = member.get_text(strip=True)
-                if axis and member_value:
-                    dims.append((axis, member_value))
-            if not _context_is_allowed(dims):
-                continue
-        period = ctx.find(lambda t: t.name and t.name.lower().endswith("period"))
-        if not period:
-            continue
-        start_node = period.find(lambda t: t.name and t.name.lower().endswith("startdate"))
-        end_node = period.find(lambda t: t.name and t.name.lower().endswith("enddate"))
-        instant_node = period.find(lambda t: t.name and t.name.lower().endswith("instant"))
-        start = start_node.get_text(strip=True) if start_node else None
-        end = end_node.get_text(strip=True) if end_node else None
-        instant = instant_node.get_text(strip=True) if instant_node else None
+    for ctx_id, start, end, instant in raw_contexts:
+        # Many contexts share the same dates; intern them so every fact references one string per date.
+        start, end, instant = _intern_optional(start), _intern_optional(end), _intern_optional(instant)
         if instant:
             contexts[ctx_id] = {"period_end": instant, "period_type": "instant"}
             if fallback_period_end is None:
@@ -293,26 +254,32 @@ def parse_inline_xbrl(html_content: bytes) -> List[Dict[str, Optional[str]]]:
             # Prefer duration as fallback when available.
             fallback_period_end = end or fallback_period_end
             fallback_period_type = "duration" if end else fallback_period_type
+    return contexts, fallback_period_end, fallback_period_type
+
+
+def _build_facts(
+    raw_contexts: List[_RawContext],
+    raw_facts: List[_RawFact],
+    unit_map: Dict[str, str],
+    granularity: str,
+) -> List[Dict[str, Optional[str]]]:
+    """Select preferred contexts per statement and emit fact dicts; shared by both parse paths."""
+    contexts, fallback_period_end, fallback_period_type = _build_context_map(raw_contexts)
 
     anchor_contexts = {stmt: set() for stmt in ANCHOR_LINE_ITEMS.keys()}
     anchor_candidates: Dict[str, Dict[str, List[Dict[str, Optional[str]]]]] = {
         stmt: {} for stmt in ANCHOR_LINE_ITEMS.keys()
     }
-    for tag in soup.find_all():
-        name = tag.get("name")
-        if not name or name not in TAG_MAP:
-            continue
-        mapping_entry = TAG_MAP[name]
-        mappings = mapping_entry if isinstance(mapping_entry, list) else [mapping_entry]
-        ctx_ref = tag.get("contextref")
+    for raw in raw_facts:
+        ctx_ref = raw.context_ref
         if ctx_ref and ctx_ref not in contexts:
             continue
         ctx_data = contexts.get(ctx_ref or "", {})
         period_end = ctx_data.get("period_end")
         period_start = ctx_data.get("start")
         period_type = ctx_data.get("period_type")
-        for line_item, statement in mappings:
-            if line_item in ANCHOR_LINE_ITEMS.get(statement, set()) and ctx_ref:
+        for line_item, statement in raw.mappings:
+            if line_item in ANCHOR_LINE_ITEMS.get(statement, _EMPTY_FS) and ctx_ref:
                 anchor_contexts[statement].add(ctx_ref)
                 if period_end:
                     anchor_candidates[statement].setdefault(period_end, []).append(
@@ -347,29 +314,23 @@ def parse_inline_xbrl(html_content: bytes) -> List[Dict[str, Optional[str]]]:
             }
 
     facts: List[Dict[str, Optional[str]]] = []
-    for tag in soup.find_all():
-        name = tag.get("name")
-        if not name or name not in TAG_MAP:
-            continue
-        mapping_entry = TAG_MAP[name]
-        mappings = mapping_entry if isinstance(mapping_entry, list) else [mapping_entry]
-        text = tag.get_text(strip=True)
-        amount = _apply_scale(_parse_amount(text), tag.get("scale"))
-        amount = _apply_decimals(amount, tag.get("decimals"))
-        amount = _apply_ix_sign(amount, tag.get("sign"))
-        ctx_ref = tag.get("contextref")
+    for raw in raw_facts:
+        ctx_ref = raw.context_ref
         if ctx_ref and ctx_ref not in contexts:
             # Skip facts tied to disallowed/segment-heavy contexts.
             continue
+        # decimals indicate precision, not scale, so only scale and sign change the amount.
+        amount = _apply_ix_sign(_apply_scale(_parse_amount(raw.text), raw.scale), raw.sign)
         ctx_data = contexts.get(ctx_ref or "", {})
         period_end = ctx_data.get("period_end") or fallback_period_end
         period_start = ctx_data.get("start")
         period_type = ctx_data.get("period_type") or fallback_period_type or "unknown"
-        raw_unit = tag.get("unitref") or tag.get("unit") or "USD"
-        unit = unit_map.get(raw_unit, _normalize_unit(raw_unit))
-        for line_item, statement in mappings:
-            anchors = anchor_contexts.get(statement, set())
-            if anchors and line_item not in ANCHOR_LINE_ITEMS.get(statement, set()):
+        unit = unit_map.get(raw.unit_ref)
+        if unit is None:
+            unit = sys.intern(_normalize_unit(raw.unit_ref))
+        for line_item, statement in raw.mappings:
+            anchors = anchor_contexts.get(statement, _EMPTY_FS)
+            if anchors and line_item not in ANCHOR_LINE_ITEMS.get(statement, _EMPTY_FS):
                 if not ctx_ref or ctx_ref not in anchors:
                     continue
             preferred_by_period = preferred_contexts.get(statement)
@@ -383,7 +344,7 @@ def parse_inline_xbrl(html_content: bytes) -> List[Dict[str, Optional[str]]]:
                     "statement": statement,
                     "value": amount,
                     "unit": unit,
-                    "xbrl_tag": name,
+                    "xbrl_tag": _intern_optional(raw.name),
                     "context_ref": ctx_ref,
                     "period_start": period_start,
                     "period_end": period_end,
@@ -393,6 +354,178 @@ def parse_inline_xbrl(html_content: bytes) -> List[Dict[str, Optional[str]]]:
     return facts
 
 
+def parse_inline_xbrl(html_content: Union[bytes, memoryview, mmap.mmap]) -> List[Dict[str, Optional[str]]]:
+    """Extract a small set of inline XBRL facts by tag name, including period info.
+
+    Accepts ``bytes`` or any bytes-like buffer; an ``mmap`` is streamed from its current position without a copy.
+    """
+    source = html_content if isinstance(html_content, mmap.mmap) else io.BytesIO(html_content)
+    return parse_inline_xbrl_streaming(source)
+
+
+@lru_cache(maxsize=1024)
+def _local_name(tag: str) -> str:
+    """Lowercased element name without its namespace, matching the suffix checks used on bs4 tags."""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _element_text(elem) -> str:
+    return "".join(piece.strip() for piece in elem.itertext())
+
+
+def _find_descendant(elem, suffix: str):
+    for node in elem.iterdescendants():
+        if isinstance(node.tag, str) and _local_name(node.tag).endswith(suffix):
+            return node
+    return None
+
+
+def _context_from_element(elem) -> Optional[_RawContext]:
+    ctx_id = elem.get("id")
+    if not ctx_id:
+        return None
+    segment = _find_descendant(elem, "segment")
+    if segment is not None:
+        if _find_descendant(segment, "typedmember") is not None:
+            return None
+        for member in segment.iterdescendants():
+            if not isinstance(member.tag, str) or not _local_name(member.tag).endswith("explicitmember"):
+                continue
+            axis = member.get("dimension")
+            member_value = _element_text(member)
+            # One disallowed dimension rejects the context, so stop at the first one.
+            if axis and member_value and not _dimension_is_allowed(axis, member_value):
+                return None
+    period = _find_descendant(elem, "period")
+    if period is None:
+        return None
+    start_node = _find_descendant(period, "startdate")
+    end_node = _find_descendant(period, "enddate")
+    instant_node = _find_descendant(period, "instant")
+    return (
+        ctx_id,
+        _element_text(start_node) if start_node is not None else None,
+        _element_text(end_node) if end_node is not None else None,
+        _element_text(instant_node) if instant_node is not None else None,
+    )
+
+
+def _unit_from_element(elem) -> Optional[str]:
+    divide = _find_descendant(elem, "divide")
+    if divide is not None:
+        numerator = _find_descendant(divide, "unitnumerator")
+        denominator = _find_descendant(divide, "unitdenominator")
+        num_measure = _find_descendant(numerator, "measure") if numerator is not None else None
+        den_measure = _find_descendant(denominator, "measure") if denominator is not None else None
+        num_unit = _normalize_unit(_element_text(num_measure) if num_measure is not None else None)
+        den_unit = _normalize_unit(_element_text(den_measure) if den_measure is not None else None)
+        if num_unit == "USD" and den_unit == "SHARES":
+            return "USDPERSHARE"
+        if num_unit and den_unit:
+            return f"{num_unit}/{den_unit}"
+        return _normalize_unit(elem.get("id"))
+    measure = _find_descendant(elem, "measure")
+    if measure is not None:
+        return _normalize_unit(_element_text(measure))
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _structural_kind(tag: str) -> str:
+    """Classify a Clark tag once: "context", "unit", or "" for everything else."""
+    local = _local_name(tag)
+    if local.endswith("context"):
+        return "context"
+    if local.endswith("unit"):
+        return "unit"
+    return ""
+
+
+def parse_inline_xbrl_streaming(source: Union[str, IO[bytes]]) -> List[Dict[str, Optional[str]]]:
+    """Stream-parse inline XBRL facts so large filings never sit fully in memory.
+
+    ``source`` is a path or any readable binary object (an open file, or an ``mmap`` of one). Only contexts,
+    units and mapped facts are retained; every other element is cleared as soon as it closes.
+    """
+    unit_map: Dict[str, str] = {}
+    raw_contexts: List[_RawContext] = []
+    # Slots are reserved on the start event so nested facts keep document order, as bs4's find_all does.
+    fact_slots: List[Optional[_RawFact]] = []
+    period_focus: Optional[str] = None
+    document_type: Optional[str] = None
+    # Open elements whose subtree must stay intact until their end event: (element, kind, fact slot).
+    captured: List[Tuple[object, str, int]] = []
+
+    # HTML mode, like the html.parser backend it replaced: stray close tags, script bodies and concatenated documents
+    # are recovered rather than ending the parse, and tag and attribute names arrive lowercased.
+    events = etree.iterparse(source, events=("start", "end"), html=True, huge_tree=True, recover=True)
+    try:
+        for event, elem in events:
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue
+            if event == "start":
+                kind = _structural_kind(tag)
+                if kind:
+                    captured.append((elem, kind, -1))
+                    continue
+                name = elem.get("name")
+                if not name:
+                    continue
+                if name in _TAG_MAPPINGS:
+                    fact_slots.append(None)
+                    captured.append((elem, "fact", len(fact_slots) - 1))
+                elif name.lower() in {"dei:documentfiscalperiodfocus", "dei:documenttype"}:
+                    captured.append((elem, "metadata", -1))
+                continue
+
+            if captured and captured[-1][0] is elem:
+                _, kind, slot = captured.pop()
+                if kind == "context":
+                    raw_context = _context_from_element(elem)
+                    if raw_context is not None:
+                        raw_contexts.append(raw_context)
+                elif kind == "unit":
+                    unit_id = elem.get("id")
+                    unit = _unit_from_element(elem) if unit_id else None
+                    if unit_id and unit is not None:
+                        unit_map[unit_id] = sys.intern(unit)
+                elif kind == "fact":
+                    # html.parser lowercases attribute names; mirror that so contextRef/unitRef resolve the same way.
+                    attrs = {key.lower(): value for key, value in elem.attrib.items()}
+                    name = attrs["name"]
+                    fact_slots[slot] = _RawFact(
+                        name,
+                        _TAG_MAPPINGS[name],
+                        _element_text(elem),
+                        attrs.get("scale"),
+                        attrs.get("sign"),
+                        attrs.get("contextref"),
+                        attrs.get("unitref") or attrs.get("unit") or "USD",
+                    )
+                elif not (period_focus and document_type):
+                    lowered = elem.get("name", "").lower()
+                    if lowered == "dei:documentfiscalperiodfocus":
+                        period_focus = _element_text(elem)
+                    elif lowered == "dei:documenttype":
+                        document_type = _element_text(elem)
+            if captured:
+                continue
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+    except etree.XMLSyntaxError as exc:
+        # Raised only when nothing parseable is left (empty or truncated downloads); there are no facts to keep.
+        logger.warning("Unparseable inline XBRL document: %s", exc)
+        return []
+
+    raw_facts = [raw for raw in fact_slots if raw is not None]
+    granularity = _infer_granularity(period_focus, document_type)
+    return _build_facts(raw_contexts, raw_facts, unit_map, granularity)
+
+
 def persist_fact(
     accession: str,
     cik: str,
@@ -407,11 +540,9 @@ def persist_fact(
     source_path: Optional[str] = None,
     xbrl_tag: Optional[str] = None,
     context_ref: Optional[str] = None,
-) -> bool:
+) -> None:
+    """Insert one fact row; ``ticker`` must already be uppercased by the caller."""
     ensure_schema()
-    if not is_allowed(statement, line_item):
-        logger.info("Dropping fact with disallowed line item %s/%s", statement, line_item)
-        return False
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -436,7 +567,7 @@ def persist_fact(
                 (
                     accession,
                     cik,
-                    ticker.upper(),
+                    ticker,
                     period_start,
                     period_end,
                     period_type,
@@ -450,7 +581,6 @@ def persist_fact(
                 ),
             )
         conn.commit()
-    return True
 
 
 def _purge_existing_facts(accession: str, ticker: str) -> None:
@@ -459,7 +589,7 @@ def _purge_existing_facts(accession: str, ticker: str) -> None:
         with conn.cursor() as cur:
             cur.execute(
                 "DELETE FROM facts WHERE accession = %s AND ticker = %s",
-                (accession, ticker.upper()),
+                (accession, ticker),
             )
         conn.commit()
 
@@ -468,96 +598,30 @@ def parse_and_store(accession: str, cik: str, ticker: str, html_path: str) -> Di
     """Parse a saved filing HTML and store a few demo facts."""
     if not os.path.isfile(html_path):
         raise FileNotFoundError(html_path)
-    with open(html_path, "rb") as f:
-        content = f.read()
-    parsed_rows = parse_simple_table(content)
-    inserted = 0
-    dropped = 0
-    pending_facts: List[Dict[str, Optional[str]]] = []
-    if parsed_rows:
-        for row in parsed_rows:
-            for key in list(row.keys()):
-                lowered = key.lower()
-                if "revenue" in lowered:
-                    value = _parse_amount(row[key])
-                    if value is not None:
-                        pending_facts.append(
-                            {
-                                "line_item": "revenue",
-                                "statement": "income_statement",
-                                "value": value,
-                                "unit": "USD",
-                                "xbrl_tag": None,
-                                "context_ref": None,
-                                "period_start": None,
-                                "period_end": None,
-                                "period_type": "duration",
-                            }
-                        )
-                if "net income" in lowered or "net loss" in lowered:
-                    value = _parse_amount(row[key])
-                    if value is not None:
-                        pending_facts.append(
-                            {
-                                "line_item": "net_income",
-                                "statement": "income_statement",
-                                "value": value,
-                                "unit": "USD",
-                                "xbrl_tag": None,
-                                "context_ref": None,
-                                "period_start": None,
-                                "period_end": None,
-                                "period_type": "duration",
-                            }
-                        )
-                if "ebitda" in lowered:
-                    value = _parse_amount(row[key])
-                    if value is not None:
-                        pending_facts.append(
-                            {
-                                "line_item": "ebitda",
-                                "statement": "income_statement",
-                                "value": value,
-                                "unit": "USD",
-                                "xbrl_tag": None,
-                                "context_ref": None,
-                                "period_start": None,
-                                "period_end": None,
-                                "period_type": "duration",
-                            }
-                        )
-    # XBRL path (primary)
-    inline_facts = parse_inline_xbrl(content)
-    for fact in inline_facts:
-        if fact["value"] is None:
-            continue
-        pending_facts.append(fact)
-
-    if not pending_facts:
-        logger.info("Parsed 0 facts from %s", html_path)
+    ticker_up = ticker.upper()
+    # XBRL path (primary); streamed from disk so large filings are never read into memory whole.
+    try:
+        inline_facts = parse_inline_xbrl_streaming(html_path)
+    except (etree.Error, OSError):
+        # A truncated or unreadable download stores nothing; the ingest job still completes.
+        logger.exception("Failed to parse %s; storing no facts", html_path)
         return {"inserted": 0, "dropped": 0}
+    pending_facts: List[Dict[str, Optional[str]]] = [fact for fact in inline_facts if fact["value"] is not None]
+    # Disallowed statement/line-item pairs never leave the parser, so the only facts dropped here lack a value.
+    dropped = len(inline_facts) - len(pending_facts)
 
-    allowed_facts: List[Dict[str, Optional[str]]] = []
-    for fact in pending_facts:
-        line_item = fact.get("line_item") or "unknown"
-        statement = fact.get("statement") or "unknown"
-        if not is_allowed(statement, line_item):
-            dropped += 1
-            continue
-        allowed_facts.append(fact)
-
-    if not allowed_facts:
-        logger.info("Parsed 0 allowed facts from %s (dropped %d)", html_path, dropped)
+    if not pending_facts:
+        logger.info("Parsed 0 facts from %s (dropped %d without a value)", html_path, dropped)
         return {"inserted": 0, "dropped": dropped}
 
-    _purge_existing_facts(accession, ticker)
-    for fact in allowed_facts:
+    _purge_existing_facts(accession, ticker_up)
+    for fact in pending_facts:
         line_item = fact.get("line_item") or "unknown"
         statement = fact.get("statement") or "unknown"
-        ok = persist_fact(
+        persist_fact(
             accession,
             cik,
-            ticker,
+            ticker_up,
             fact.get("period_start"),
             fact.get("period_end"),
             line_item,
@@ -569,10 +633,7 @@ def parse_and_store(accession: str, cik: str, ticker: str, html_path: str) -> Di
             xbrl_tag=fact.get("xbrl_tag"),
             context_ref=fact.get("context_ref"),
         )
-        if ok:
-            inserted += 1
-        else:
-            dropped += 1
 
-    logger.info("Parsed %d facts from %s (dropped %d disallowed)", inserted, html_path, dropped)
+    inserted = len(pending_facts)
+    logger.info("Parsed %d facts from %s (dropped %d without a value)", inserted, html_path, dropped)
     return {"inserted": inserted, "dropped": dropped}
@@ -1,4 +1,5 @@
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from typing import Any, Dict, List
 
 from .db import ensure_schema, get_conn
@@ -9,44 +10,63 @@ Line = Dict[str, Any]
 Period = Dict[str, Any]
 
 
+# Display position per line item, so sort keys are dict lookups rather than list.index scans.
+_ORDER_POS: Dict[str, Dict[str, int]] = {
+    stmt: {item: i for i, item in enumerate(items)} for stmt, items in STATEMENT_DISPLAY_ORDER.items()
+}
+
+# Rows for the newest max_periods period_ends of a ticker, ordered for grouping by period then statement.
+# value is cast to float8 so binary results load straight into Python floats, never via Decimal.
+_STATEMENT_ROWS_SQL = """
+    WITH keep AS (
+        SELECT DISTINCT period_end
+        FROM canonical_facts
+        WHERE ticker = %s AND period_end IS NOT NULL
+        ORDER BY period_end DESC
+        LIMIT %s
+    )
+    SELECT cf.period_end, cf.statement, cf.line_item, cf.value::float8, cf.unit
+    FROM canonical_facts cf
+    JOIN keep USING (period_end)
+    WHERE cf.ticker = %s
+    ORDER BY cf.period_end DESC, cf.statement, cf.line_item
+"""
+
+
 def build_statements(ticker: str, max_periods: int = 8) -> Dict[str, List[Period]]:
     """Group canonical facts into simple statements keyed by period_end."""
+    # Import here to avoid hard dependency during pure aggregation tests.
+    from psycopg.rows import tuple_row
+
     ensure_schema()
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT period_end, statement, line_item, value, unit
-                FROM canonical_facts
-                WHERE ticker = %s AND period_end IS NOT NULL
-                ORDER BY period_end DESC, statement, line_item
-                """,
-                (ticker.upper(),),
-            )
-            rows = cur.fetchall()
-
-    period_map: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"period_end": None, "lines": defaultdict(list)})
-    for period_end, statement, line_item, value, unit in rows:
-        key = period_end.isoformat()
-        period_entry = period_map[key]
-        period_entry["period_end"] = period_end.isoformat()
-        if statement is None or line_item is None:
-            continue
-        period_entry["lines"][statement].append({"line_item": line_item, "value": float(value) if value is not None else None, "unit": unit})
-
-    # Convert to list sorted by period_end desc and limit.
+    ticker_up = ticker.upper()
+    # Postgres rejects a negative LIMIT; treat any max_periods below zero as "no periods".
+    max_periods = max(max_periods, 0)
     periods: List[Period] = []
-    for _, data in sorted(period_map.items(), key=lambda kv: kv[0], reverse=True):
-        ordered_lines: Dict[str, list] = {}
-        for stmt, items in data["lines"].items():
-            order = STATEMENT_DISPLAY_ORDER.get(stmt, [])
-            ordered_lines[stmt] = sorted(
-                items,
-                key=lambda it: (
-                    order.index(it["line_item"]) if it.get("line_item") in order else len(order),
-                    it.get("line_item") or "",
-                ),
-            )
-        data["lines"] = ordered_lines
-        periods.append(data)
-    return {"periods": periods[:max_periods]}
+    # Only the newest max_periods period_ends are fetched; older history never leaves the database.
+    with get_conn() as conn:
+        # Named (server-side) cursor: rows are pulled in itersize batches instead of one fetchall list, and the
+        # binary protocol skips text parsing of dates and numbers.
+        with conn.cursor(name="cf_stream", row_factory=tuple_row) as cur:
+            cur.itersize = 2000
+            cur.execute(_STATEMENT_ROWS_SQL, (ticker_up, max_periods, ticker_up), binary=True)
+            # Rows are already ordered by period_end DESC, so each period is one contiguous run.
+            for period_end, group in groupby(cur, key=itemgetter(0)):
+                lines: Dict[str, List[Line]] = {}
+                for _, statement, line_item, value, unit in group:
+                    if statement is None or line_item is None:
+                        continue
+                    bucket = lines.get(statement)
+                    if bucket is None:
+                        bucket = lines[statement] = []
+                    bucket.append({"line_item": line_item, "value": value, "unit": unit})
+                for stmt, items in lines.items():
+                    pos = _ORDER_POS.get(stmt, {})
+                    fallback = len(STATEMENT_DISPLAY_ORDER.get(stmt, []))
+                    # Buckets arrive sorted by line_item from SQL; a stable sort on position alone keeps that tiebreak.
+                    items.sort(key=lambda line, p=pos, f=fallback: p.get(line["line_item"], f))
+                periods.append({"period_end": period_end.isoformat(), "lines": lines})
+                if len(periods) >= max_periods:
+                    # Stop pulling batches as soon as the newest max_periods are in hand.
+                    break
+    return {"periods": periods}
@@ -1,4 +1,5 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 from workers.jobs import backfill_all
@@ -28,3 +29,22 @@ class BackfillAllTests(unittest.TestCase):
         called = [call.args[0] for call in mocked.call_args_list]
         self.assertEqual(called, ["NVDA", "AMZN"])
         self.assertEqual(result["success"], 2)
+
+    def test_parallel_workers_keep_ticker_order(self) -> None:
+        def fake_pool(max_workers, mp_context):
+            return ThreadPoolExecutor(max_workers=max_workers)
+
+        def fake_backfill(ticker, **kwargs):
+            if ticker == "AMZN":
+                raise RuntimeError("boom")
+            return {"ticker": ticker}
+
+        with patch("workers.jobs.backfill_all.ProcessPoolExecutor", side_effect=fake_pool) as pool, patch(
+            "workers.jobs.backfill_all.backfill_ticker", side_effect=fake_backfill
+        ):
+            result = backfill_all.backfill_all(tickers=["nvda", "amzn", "aapl"], limit=1, workers=4)
+
+        self.assertEqual(pool.call_args.kwargs["max_workers"], 3)
+        self.assertEqual([r["ticker"] for r in result["results"]], ["NVDA", "AMZN", "AAPL"])
+        self.assertEqual(result["success"], 2)
+        self.assertEqual(result["failed"], 1)
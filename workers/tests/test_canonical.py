@@ -1,9 +1,31 @@
+import hashlib
+import mmap
+import os
+import pickle
+import sys
 import unittest
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import date
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
+from typing import Iterator, Optional, Sequence
 
-from workers.canonical import aggregate_canonical_rows, log_tie_checks, _align_cash_flow_starts
-from workers.parser import parse_inline_xbrl
+from workers import canonical as canonical_module
+from workers import parser as parser_module
+from workers import tag_map as tag_map_module
+from workers.canonical import (
+    aggregate_canonical_rows,
+    log_tie_checks,
+    _align_cash_flow_starts,
+)
+from workers.parser import parse_inline_xbrl_streaming
+
+# Opt-in: point at a directory to reuse parsed fixture facts across runs (leave unset in CI).
+PARSE_CACHE_DIR = os.getenv("PARSE_FIXTURE_CACHE_DIR")
 
 
 def _resolve_fixture_path(relative_path: str) -> Path:
@@ -17,135 +39,401 @@ def _resolve_fixture_path(relative_path: str) -> Path:
     return path
 
 
+@contextmanager
+def _mmap_bytes(path: Path) -> Iterator[mmap.mmap]:
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+def _parse_fixture(html_path: Path) -> list[dict]:
+    # mmap lets the parser read the filing straight from the page cache instead of a full bytes copy.
+    with _mmap_bytes(html_path) as buf:
+        return parse_inline_xbrl_streaming(buf)
+
+
+_PARSE_SOURCE_MODULES = (parser_module, tag_map_module, canonical_module)
+
+
+@lru_cache(maxsize=8)
+def _cached_parse(path_str: str) -> tuple[dict, ...]:
+    """Parse a fixture once per process; with PARSE_FIXTURE_CACHE_DIR set, also reuse a pickle across runs."""
+    html_path = Path(path_str)
+    if not PARSE_CACHE_DIR:
+        return tuple(_parse_fixture(html_path))
+    fixture_stat = html_path.stat()
+    # Parse output also depends on TAG_MAP and the allowed (statement, line_item) pairs, not just the parser.
+    source_mtimes = ":".join(str(Path(module.__file__).stat().st_mtime_ns) for module in _PARSE_SOURCE_MODULES)
+    key = hashlib.sha1(
+        f"{html_path.resolve()}:{fixture_stat.st_mtime_ns}:{fixture_stat.st_size}:{source_mtimes}".encode()
+    ).hexdigest()
+    cache_path = Path(PARSE_CACHE_DIR) / f"{html_path.stem}.{key}.facts.pkl"
+    if cache_path.is_file():
+        with cache_path.open("rb") as f:
+            return tuple(pickle.load(f))
+    facts = _parse_fixture(html_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("wb") as f:
+        pickle.dump(facts, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return tuple(facts)
+
+
+# Parsed facts always carry these keys; one C-level call fetches them all per fact.
+_FACT_FIELDS = itemgetter("period_end", "period_type", "statement", "line_item", "value", "unit")
+
+
+def _columns_from_facts(facts: Sequence[dict], ticker: str, cik: str) -> dict[str, Sequence]:
+    """Lay parsed facts out column-wise, pulling every field with one itemgetter call per fact.
+
+    Grouping columns are interned so the aggregator's key hashing and comparisons hit the identity fast path.
+    """
+    count = len(facts)
+    period_end, period_type, statement, line_item, value, unit = (
+        zip(*map(_FACT_FIELDS, facts)) if facts else ((),) * 6
+    )
+    return {
+        "id": range(1, count + 1),
+        "ticker": [sys.intern(ticker)] * count,
+        "cik": [sys.intern(cik)] * count,
+        "accession": ["acc-real"] * count,
+        "period_end": _interned(period_end),
+        "period_type": _interned(period_type),
+        "statement": _interned(statement),
+        "line_item": _interned(line_item),
+        "value": value,
+        "unit": _interned(unit),
+    }
+
+
+def _rows_from_columns(columns: dict[str, Sequence]) -> list[dict]:
+    """Zip staged columns back into the row dicts aggregate_canonical_rows takes."""
+    keys = tuple(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _interned(values: Sequence[Optional[str]]) -> list[Optional[str]]:
+    return [sys.intern(value) if isinstance(value, str) else value for value in values]
+
+
+_COVERAGE_FIELDS = itemgetter("period_end", "statement", "line_item")
+
+
 def _coverage_counts(html_path: Path, period_end: str, ticker: str, cik: str) -> tuple[dict[str, int], int]:
-    facts = parse_inline_xbrl(html_path.read_bytes())
-    rows = []
-    for i, fact in enumerate(facts, start=1):
-        rows.append(
-            {
-                "id": i,
-                "ticker": ticker,
-                "cik": cik,
-                "accession": "acc-real",
-                "period_end": fact.get("period_end"),
-                "period_type": fact.get("period_type"),
-                "statement": fact.get("statement"),
-                "line_item": fact.get("line_item"),
-                "value": fact.get("value"),
-                "unit": fact.get("unit"),
-            }
-        )
-    aggregated = aggregate_canonical_rows(rows)
-    by_statement: dict[str, set[str]] = {}
-    for row in aggregated:
-        if row.get("period_end") != period_end:
-            continue
-        statement = row.get("statement")
-        line_item = row.get("line_item")
-        if statement and line_item:
-            by_statement.setdefault(statement, set()).add(line_item)
-    counts = {statement: len(items) for statement, items in by_statement.items()}
-    total = sum(counts.values())
+    aggregated = aggregate_canonical_rows(_rows_from_columns(_columns_from_facts(_cached_parse(str(html_path)), ticker, cik)))
+    # Aggregated rows always carry these keys and only allowed (non-empty) statement/line_item pairs.
+    pairs = {
+        (statement, line_item)
+        for row_period_end, statement, line_item in map(_COVERAGE_FIELDS, aggregated)
+        if row_period_end == period_end
+    }
+    counts = dict(Counter(statement for statement, _ in pairs))
+    total = len(pairs)
     return counts, total
 
 
+def _index(rows: Sequence[dict]) -> defaultdict[tuple, list[dict]]:
+    """Group rows by (statement, line_item) once so lookups are O(1) instead of a scan per assertion."""
+    idx: defaultdict[tuple, list[dict]] = defaultdict(list)
+    for row in rows:
+        idx[(row.get("statement"), row.get("line_item"))].append(row)
+    return idx
+
+
+def _sorted_index(rows: Sequence[dict]) -> dict[tuple, list[dict]]:
+    """Like _index, but each bucket is sorted by period_end so the latest row is ``bucket[-1]``."""
+    idx = _index(rows)
+    for bucket in idx.values():
+        bucket.sort(key=lambda row: row["period_end"])
+    return dict(idx)
+
+
+def _frozen_rows(*rows: dict) -> tuple[MappingProxyType, ...]:
+    return tuple(MappingProxyType(row) for row in rows)
+
+
+# Synthetic fixtures are built once at import; read-only views keep tests from mutating shared rows.
+_GROUPS_ROWS = _frozen_rows(
+    {
+        "id": 2,
+        "ticker": "aapl",
+        "cik": "0000320193",
+        "accession": "acc-1",
+        "period_end": date(2023, 6, 24),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "revenue",
+        "value": 100,
+        "unit": "usd",
+    },
+    {
+        "id": 1,
+        "ticker": "aapl",
+        "cik": "0000320193",
+        "accession": "acc-2",
+        "period_end": date(2023, 6, 24),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "revenue",
+        "value": 120,
+        "unit": "usd",
+    },
+    {
+        "id": 3,
+        "ticker": "aapl",
+        "cik": "0000320193",
+        "accession": "acc-2",
+        "period_end": None,
+        "period_type": None,
+        "statement": "balance_sheet",
+        "line_item": "cash",
+        "value": 55,
+        "unit": "usd",
+    },
+    {
+        "id": 4,
+        "ticker": "aapl",
+        "cik": "0000320193",
+        "accession": "acc-3",
+        "period_end": date(2023, 6, 24),
+        "period_type": "instant",
+        "statement": "balance_sheet",
+        "line_item": "equity",
+        "value": 200,
+        "unit": "usd",
+    },
+)
+
+
+_FILTER_ROWS = _frozen_rows(
+    {
+        "id": 1,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_end": date(2024, 12, 31),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "revenue",
+        "value": 10,
+        "unit": "usd",
+    },
+    {
+        "id": 2,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_end": date(2024, 12, 31),
+        "period_type": "duration",
+        "statement": "other",
+        "line_item": "unknown",
+        "value": 5,
+        "unit": "usd",
+    },
+)
+
+
+_DURATION_ROWS = _frozen_rows(
+    {
+        "id": 1,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2023, 1, 1),
+        "period_end": date(2023, 6, 30),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "revenue",
+        "value": 300,
+        "unit": "usd",
+    },
+    {
+        "id": 2,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2023, 4, 1),
+        "period_end": date(2023, 6, 30),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "revenue",
+        "value": 120,
+        "unit": "usd",
+    },
+)
+
+
+_RESIDUAL_ROWS = _frozen_rows(
+    {
+        "id": 1,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_end": date(2024, 3, 31),
+        "period_type": "instant",
+        "statement": "balance_sheet",
+        "line_item": "assets_current",
+        "value": 100,
+        "unit": "USD",
+    },
+    {
+        "id": 2,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_end": date(2024, 3, 31),
+        "period_type": "instant",
+        "statement": "balance_sheet",
+        "line_item": "cash",
+        "value": 40,
+        "unit": "USD",
+    },
+)
+
+
+_DERIVATION_ROWS = _frozen_rows(
+    {
+        "id": 1,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "revenue",
+        "value": 100.0,
+        "unit": "USD",
+    },
+    {
+        "id": 2,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "gross_profit",
+        "value": 60.0,
+        "unit": "USD",
+    },
+    {
+        "id": 3,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "operating_expenses",
+        "value": 30.0,
+        "unit": "USD",
+    },
+    {
+        "id": 4,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "income_statement",
+        "line_item": "operating_income",
+        "value": 20.0,
+        "unit": "USD",
+    },
+    {
+        "id": 5,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "cash_flow",
+        "line_item": "depreciation_amortization",
+        "value": 5.0,
+        "unit": "USD",
+    },
+    {
+        "id": 6,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "cash_flow",
+        "line_item": "cfo",
+        "value": 50.0,
+        "unit": "USD",
+    },
+    {
+        "id": 7,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "cash_flow",
+        "line_item": "cfi",
+        "value": -10.0,
+        "unit": "USD",
+    },
+    {
+        "id": 8,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "cash_flow",
+        "line_item": "cff",
+        "value": -5.0,
+        "unit": "USD",
+    },
+    {
+        "id": 9,
+        "ticker": "demo",
+        "cik": "0000000000",
+        "accession": "acc",
+        "period_start": date(2024, 1, 1),
+        "period_end": date(2024, 3, 31),
+        "period_type": "duration",
+        "statement": "cash_flow",
+        "line_item": "fx_on_cash",
+        "value": 2.0,
+        "unit": "USD",
+    },
+)
+
+
 class AggregateCanonicalRowsTests(unittest.TestCase):
     def test_groups_by_period_and_normalizes_types(self) -> None:
-        rows = [
-            {
-                "id": 2,
-                "ticker": "aapl",
-                "cik": "0000320193",
-                "accession": "acc-1",
-                "period_end": date(2023, 6, 24),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "revenue",
-                "value": 100,
-                "unit": "usd",
-            },
-            {
-                "id": 1,
-                "ticker": "aapl",
-                "cik": "0000320193",
-                "accession": "acc-2",
-                "period_end": date(2023, 6, 24),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "revenue",
-                "value": 120,
-                "unit": "usd",
-            },
-            {
-                "id": 3,
-                "ticker": "aapl",
-                "cik": "0000320193",
-                "accession": "acc-2",
-                "period_end": None,
-                "period_type": None,
-                "statement": "balance_sheet",
-                "line_item": "cash",
-                "value": 55,
-                "unit": "usd",
-            },
-            {
-                "id": 4,
-                "ticker": "aapl",
-                "cik": "0000320193",
-                "accession": "acc-3",
-                "period_end": date(2023, 6, 24),
-                "period_type": "instant",
-                "statement": "balance_sheet",
-                "line_item": "equity",
-                "value": 200,
-                "unit": "usd",
-            },
-        ]
+        rows = _GROUPS_ROWS
         aggregated = aggregate_canonical_rows(rows, default_period_end=date(2023, 6, 24))
         self.assertEqual(len(aggregated), 3)
 
-        revenue = next(r for r in aggregated if r["line_item"] == "revenue")
+        idx = _index(aggregated)
+        revenue = idx[("income_statement", "revenue")][0]
         self.assertEqual(revenue["value"], 120.0)
         self.assertEqual(revenue["source_fact_id"], 1)
         self.assertEqual(revenue["period_type"], "duration")
         self.assertEqual(revenue["ticker"], "AAPL")
         self.assertEqual(revenue["unit"], "USD")
 
-        cash = next(r for r in aggregated if r["line_item"] == "cash")
+        cash = idx[("balance_sheet", "cash")][0]
         self.assertEqual(cash["period_type"], "instant")
         self.assertEqual(cash["period_end"], date(2023, 6, 24))
 
-        equity = next(r for r in aggregated if r["line_item"] == "equity")
+        equity = idx[("balance_sheet", "equity")][0]
         self.assertEqual(equity["value"], 200.0)
         self.assertEqual(equity["source_fact_id"], 4)
 
     def test_filters_unknown_statements(self) -> None:
-        rows = [
-            {
-                "id": 1,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_end": date(2024, 12, 31),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "revenue",
-                "value": 10,
-                "unit": "usd",
-            },
-            {
-                "id": 2,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_end": date(2024, 12, 31),
-                "period_type": "duration",
-                "statement": "other",
-                "line_item": "unknown",
-                "value": 5,
-                "unit": "usd",
-            },
-        ]
+        rows = _FILTER_ROWS
         aggregated = aggregate_canonical_rows(rows)
         self.assertEqual(len(aggregated), 1)
         self.assertEqual(aggregated[0]["line_item"], "revenue")
@@ -256,34 +544,7 @@ class TieCheckTests(unittest.TestCase):
         self.assertTrue(any("Cash flow tie off" in msg for msg in violations))
 
     def test_prefers_shorter_duration_for_income_statement(self) -> None:
-        rows = [
-            {
-                "id": 1,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2023, 1, 1),
-                "period_end": date(2023, 6, 30),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "revenue",
-                "value": 300,
-                "unit": "usd",
-            },
-            {
-                "id": 2,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2023, 4, 1),
-                "period_end": date(2023, 6, 30),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "revenue",
-                "value": 120,
-                "unit": "usd",
-            },
-        ]
+        rows = _DURATION_ROWS
         aggregated = aggregate_canonical_rows(rows)
         self.assertEqual(len(aggregated), 1)
         self.assertEqual(aggregated[0]["value"], 120.0)
@@ -392,175 +653,48 @@ class CashFlowAlignmentTests(unittest.TestCase):
         self.assertEqual(line_map["change_in_cash"]["value"], 40.0)
 
     def test_adds_balance_sheet_residuals(self) -> None:
-        rows = [
-            {
-                "id": 1,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_end": date(2024, 3, 31),
-                "period_type": "instant",
-                "statement": "balance_sheet",
-                "line_item": "assets_current",
-                "value": 100,
-                "unit": "USD",
-            },
-            {
-                "id": 2,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_end": date(2024, 3, 31),
-                "period_type": "instant",
-                "statement": "balance_sheet",
-                "line_item": "cash",
-                "value": 40,
-                "unit": "USD",
-            },
-        ]
+        rows = _RESIDUAL_ROWS
         aggregated = aggregate_canonical_rows(rows)
         from workers.canonical import _add_balance_sheet_residuals
 
         enriched = _add_balance_sheet_residuals(aggregated)
-        residuals = [r for r in enriched if r.get("line_item") == "other_assets_current"]
+        residuals = _index(enriched)[("balance_sheet", "other_assets_current")]
         self.assertEqual(len(residuals), 1)
         self.assertAlmostEqual(residuals[0]["value"], 60.0)
 
     def test_adds_income_and_cash_flow_derivations(self) -> None:
-        rows = [
-            {
-                "id": 1,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "revenue",
-                "value": 100.0,
-                "unit": "USD",
-            },
-            {
-                "id": 2,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "gross_profit",
-                "value": 60.0,
-                "unit": "USD",
-            },
-            {
-                "id": 3,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "operating_expenses",
-                "value": 30.0,
-                "unit": "USD",
-            },
-            {
-                "id": 4,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "income_statement",
-                "line_item": "operating_income",
-                "value": 20.0,
-                "unit": "USD",
-            },
-            {
-                "id": 5,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "cash_flow",
-                "line_item": "depreciation_amortization",
-                "value": 5.0,
-                "unit": "USD",
-            },
-            {
-                "id": 6,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "cash_flow",
-                "line_item": "cfo",
-                "value": 50.0,
-                "unit": "USD",
-            },
-            {
-                "id": 7,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "cash_flow",
-                "line_item": "cfi",
-                "value": -10.0,
-                "unit": "USD",
-            },
-            {
-                "id": 8,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "cash_flow",
-                "line_item": "cff",
-                "value": -5.0,
-                "unit": "USD",
-            },
-            {
-                "id": 9,
-                "ticker": "demo",
-                "cik": "0000000000",
-                "accession": "acc",
-                "period_start": date(2024, 1, 1),
-                "period_end": date(2024, 3, 31),
-                "period_type": "duration",
-                "statement": "cash_flow",
-                "line_item": "fx_on_cash",
-                "value": 2.0,
-                "unit": "USD",
-            },
-        ]
+        rows = _DERIVATION_ROWS
         aggregated = aggregate_canonical_rows(rows)
         from workers.canonical import _add_income_statement_derivations, _add_cash_flow_residuals
 
         enriched = _add_income_statement_derivations(aggregated)
         enriched = _add_cash_flow_residuals(enriched)
 
+        idx = _index(enriched)
+
         def _get(statement: str, line_item: str) -> float:
-            row = next(r for r in enriched if r.get("statement") == statement and r.get("line_item") == line_item)
-            return float(row.get("value"))
+            return float(idx[(statement, line_item)][0].get("value"))
 
         self.assertAlmostEqual(_get("income_statement", "cogs"), 40.0)
         self.assertAlmostEqual(_get("income_statement", "total_expenses"), 70.0)
         self.assertAlmostEqual(_get("income_statement", "ebitda"), 25.0)
         self.assertAlmostEqual(_get("cash_flow", "change_in_cash"), 37.0)
 
+    def test_enrich_matches_individual_passes(self) -> None:
+        from workers.canonical import (
+            _add_balance_sheet_residuals,
+            _add_cash_flow_residuals,
+            _add_income_statement_derivations,
+            enrich_canonical_rows,
+        )
+
+        rows = _DERIVATION_ROWS + _RESIDUAL_ROWS
+        stepwise = _align_cash_flow_starts(aggregate_canonical_rows(rows), rows)
+        stepwise = _add_balance_sheet_residuals(stepwise)
+        stepwise = _add_income_statement_derivations(stepwise)
+        stepwise = _add_cash_flow_residuals(stepwise)
+        self.assertEqual(enrich_canonical_rows(aggregate_canonical_rows(rows), rows), stepwise)
+
     def test_derives_gross_profit_and_operating_expenses(self) -> None:
         rows = [
             {
@@ -620,8 +754,9 @@ class CashFlowAlignmentTests(unittest.TestCase):
         from workers.canonical import _add_income_statement_derivations
 
         enriched = _add_income_statement_derivations(aggregated)
-        gross_profit = next(r for r in enriched if r["line_item"] == "gross_profit")
-        operating_expenses = next(r for r in enriched if r["line_item"] == "operating_expenses")
+        idx = _index(enriched)
+        gross_profit = idx[("income_statement", "gross_profit")][0]
+        operating_expenses = idx[("income_statement", "operating_expenses")][0]
         self.assertAlmostEqual(gross_profit["value"], 60.0)
         self.assertAlmostEqual(operating_expenses["value"], 30.0)
 
@@ -656,7 +791,7 @@ class CashFlowAlignmentTests(unittest.TestCase):
         from workers.canonical import _add_balance_sheet_residuals
 
         enriched = _add_balance_sheet_residuals(aggregated)
-        liabilities = next(r for r in enriched if r["line_item"] == "liabilities")
+        liabilities = _index(enriched)[("balance_sheet", "liabilities")][0]
         self.assertAlmostEqual(liabilities["value"], 70.0)
 
     def test_derives_change_working_capital_from_components(self) -> None:
@@ -731,7 +866,7 @@ class CashFlowAlignmentTests(unittest.TestCase):
         from workers.canonical import _add_cash_flow_residuals
 
         enriched = _add_cash_flow_residuals(aggregated)
-        wc_row = next(r for r in enriched if r.get("line_item") == "change_working_capital")
+        wc_row = _index(enriched)[("cash_flow", "change_working_capital")][0]
         self.assertAlmostEqual(wc_row["value"], -2.0)
 
     def test_aligns_change_in_cash_to_cfo_start(self) -> None:
@@ -780,75 +915,92 @@ class CashFlowAlignmentTests(unittest.TestCase):
         from workers.canonical import _align_cash_flow_starts
 
         aligned = _align_cash_flow_starts(aggregated, rows)
-        change_row = next(r for r in aligned if r.get("line_item") == "change_in_cash")
+        change_row = _index(aligned)[("cash_flow", "change_in_cash")][0]
         self.assertEqual(change_row["period_start"], date(2025, 7, 1))
         self.assertAlmostEqual(change_row["value"], 8.0)
 
 
+# Latest real filings per ticker: (cik, fixture path).
+REAL_FILING_FIXTURES = {
+    "NVDA": ("0001045810", "storage/raw/0001045810/000104581025000230_primary.html"),
+    "AMZN": ("0001018724", "storage/raw/0001018724/000101872425000123_primary.html"),
+    "AAPL": ("0000320193", "storage/raw/0000320193/000032019325000079_primary.html"),
+}
+REGRESSION_FIXTURES = (
+    "storage/raw/0000320193/000032019323000064_primary.html",
+    "storage/raw/0000320193/000032019323000077_primary.html",
+    "storage/raw/0001018724/000101872423000012_primary.html",
+    "storage/raw/0001045810/000104581023000093_primary.html",
+)
+_FIXTURE_PATHS: dict[str, Path] = {}
+
+
+def setUpModule() -> None:
+    # Probe each fixture location once; tests look resolved paths up by their relative path.
+    relative_paths = [relative_path for _, relative_path in REAL_FILING_FIXTURES.values()]
+    for relative_path in (*relative_paths, *REGRESSION_FIXTURES):
+        _FIXTURE_PATHS[relative_path] = _resolve_fixture_path(relative_path)
+
+
+def _process_fixture(ticker: str, cik: str, path_str: str) -> Optional[list[dict]]:
+    """Parse and aggregate one real filing; module-level so it can run in a worker process."""
+    if not Path(path_str).is_file():
+        return None
+    return aggregate_canonical_rows(_rows_from_columns(_columns_from_facts(_cached_parse(path_str), ticker, cik)))
+
+
 class CanonicalFromRealFilingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Parse and aggregate each fixture once, in parallel since they share nothing; tests only read the results.
+        cls.fixture_paths: dict[str, Path] = {
+            ticker: _FIXTURE_PATHS[relative_path] for ticker, (_, relative_path) in REAL_FILING_FIXTURES.items()
+        }
+        tickers = list(REAL_FILING_FIXTURES)
+        ciks = [REAL_FILING_FIXTURES[ticker][0] for ticker in tickers]
+        paths = [str(cls.fixture_paths[ticker]) for ticker in tickers]
+        with ProcessPoolExecutor(max_workers=len(tickers)) as pool:
+            results = list(pool.map(_process_fixture, tickers, ciks, paths))
+        cls.aggregated: dict[str, list[dict]] = {
+            ticker: aggregated for ticker, aggregated in zip(tickers, results) if aggregated is not None
+        }
+        cls.by_line_item_sorted: dict[str, dict[tuple, list[dict]]] = {
+            ticker: _sorted_index(aggregated) for ticker, aggregated in cls.aggregated.items()
+        }
+
+    def _aggregated_for(self, ticker: str) -> list[dict]:
+        self.assertTrue(self.fixture_paths[ticker].is_file(), "Real filing fixture missing")
+        return self.aggregated[ticker]
+
+    def _sorted_for(self, ticker: str) -> dict[tuple, list[dict]]:
+        self.assertTrue(self.fixture_paths[ticker].is_file(), "Real filing fixture missing")
+        return self.by_line_item_sorted[ticker]
+
     def test_aggregates_real_filing_facts(self) -> None:
-        html_path = _resolve_fixture_path("storage/raw/0001045810/000104581025000230_primary.html")
-        self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-        facts = parse_inline_xbrl(html_path.read_bytes())
-        rows = []
-        for i, fact in enumerate(facts, start=1):
-            rows.append(
-                {
-                    "id": i,
-                    "ticker": "aapl",
-                    "cik": "0001045810",
-                    "accession": "acc-real",
-                    "period_end": fact.get("period_end"),
-                    "period_type": fact.get("period_type"),
-                    "statement": fact.get("statement"),
-                    "line_item": fact.get("line_item"),
-                    "value": fact.get("value"),
-                    "unit": fact.get("unit"),
-                }
-            )
-        aggregated = aggregate_canonical_rows(rows)
-        self.assertTrue(aggregated, "Aggregated facts should not be empty")
+        self.assertTrue(self._aggregated_for("NVDA"), "Aggregated facts should not be empty")
 
-        revenue_rows = [r for r in aggregated if r["line_item"] == "revenue"]
+        idx = self._sorted_for("NVDA")
+        revenue_rows = idx.get(("income_statement", "revenue"))
         self.assertTrue(revenue_rows)
-        latest_revenue = max(revenue_rows, key=lambda r: r["period_end"])
+        latest_revenue = revenue_rows[-1]
         self.assertEqual(latest_revenue["period_end"], "2025-10-26")
         self.assertEqual(latest_revenue["period_type"], "duration")
         self.assertAlmostEqual(latest_revenue["value"], 147811000000.0)
 
-        asset_rows = [r for r in aggregated if r["line_item"] == "assets"]
+        asset_rows = idx.get(("balance_sheet", "assets"))
         self.assertTrue(asset_rows)
-        latest_assets = max(asset_rows, key=lambda r: r["period_end"])
+        latest_assets = asset_rows[-1]
         self.assertEqual(latest_assets["period_type"], "instant")
         self.assertEqual(latest_assets["period_end"], "2025-10-26")
         self.assertAlmostEqual(latest_assets["value"], 161148000000.0)
 
     def test_aggregates_second_filing(self) -> None:
-        html_path = _resolve_fixture_path("storage/raw/0001018724/000101872425000123_primary.html")
-        self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-        facts = parse_inline_xbrl(html_path.read_bytes())
-        rows = []
-        for i, fact in enumerate(facts, start=1):
-            rows.append(
-                {
-                    "id": i,
-                    "ticker": "amzn",
-                    "cik": "0001018724",
-                    "accession": "acc-real",
-                    "period_end": fact.get("period_end"),
-                    "period_type": fact.get("period_type"),
-                    "statement": fact.get("statement"),
-                    "line_item": fact.get("line_item"),
-                    "value": fact.get("value"),
-                    "unit": fact.get("unit"),
-                }
-            )
-        aggregated = aggregate_canonical_rows(rows)
-        revenue_rows = [r for r in aggregated if r["line_item"] == "revenue"]
-        assets_rows = [r for r in aggregated if r["line_item"] == "assets"]
+        idx = self._sorted_for("AMZN")
+        revenue_rows = idx.get(("income_statement", "revenue"))
+        assets_rows = idx.get(("balance_sheet", "assets"))
         self.assertTrue(revenue_rows and assets_rows)
-        latest_rev = max(revenue_rows, key=lambda r: r["period_end"])
-        latest_assets = max(assets_rows, key=lambda r: r["period_end"])
+        latest_rev = revenue_rows[-1]
+        latest_assets = assets_rows[-1]
         self.assertEqual(latest_rev["period_end"], "2025-09-30")
         self.assertAlmostEqual(latest_rev["value"], 503538000000.0)
         self.assertEqual(latest_assets["period_type"], "instant")
@@ -856,88 +1008,42 @@ class CanonicalFromRealFilingTests(unittest.TestCase):
         self.assertAlmostEqual(latest_assets["value"], 727921000000.0)
 
     def test_aggregates_third_filing(self) -> None:
-        html_path = _resolve_fixture_path("storage/raw/0000320193/000032019325000079_primary.html")
-        self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-        facts = parse_inline_xbrl(html_path.read_bytes())
-        rows = []
-        for i, fact in enumerate(facts, start=1):
-            rows.append(
-                {
-                    "id": i,
-                    "ticker": "aapl",
-                    "cik": "0000320193",
-                    "accession": "acc-real",
-                    "period_end": fact.get("period_end"),
-                    "period_type": fact.get("period_type"),
-                    "statement": fact.get("statement"),
-                    "line_item": fact.get("line_item"),
-                    "value": fact.get("value"),
-                    "unit": fact.get("unit"),
-                }
-            )
-        aggregated = aggregate_canonical_rows(rows)
-        revenue_rows = [r for r in aggregated if r["line_item"] == "revenue"]
+        idx = self._sorted_for("AAPL")
+        revenue_rows = idx.get(("income_statement", "revenue"))
         self.assertTrue(revenue_rows)
-        latest_rev = max(revenue_rows, key=lambda r: r["period_end"])
+        latest_rev = revenue_rows[-1]
         self.assertEqual(latest_rev["period_type"], "duration")
         self.assertGreater(latest_rev["value"], 80000000000.0)
-        shares_rows = [r for r in aggregated if r["line_item"] == "shares_diluted"]
-        cfo_rows = [r for r in aggregated if r["line_item"] == "cfo"]
+        shares_rows = idx.get(("income_statement", "shares_diluted"), [])
+        cfo_rows = idx.get(("cash_flow", "cfo"), [])
         self.assertTrue(any(r["value"] for r in shares_rows))
         self.assertTrue(any(r["value"] is not None for r in cfo_rows))
 
     def test_real_filings_include_core_line_items(self) -> None:
-        fixtures = [
-            ("AAPL", "0000320193", _resolve_fixture_path("storage/raw/0000320193/000032019325000079_primary.html")),
-            ("NVDA", "0001045810", _resolve_fixture_path("storage/raw/0001045810/000104581025000230_primary.html")),
-            ("AMZN", "0001018724", _resolve_fixture_path("storage/raw/0001018724/000101872425000123_primary.html")),
-        ]
         required_by_statement = {
             "income_statement": {"revenue", "net_income"},
             "balance_sheet": {"assets", "equity"},
             "cash_flow": {"cfo"},
         }
 
-        for ticker, cik, html_path in fixtures:
-            self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-            facts = parse_inline_xbrl(html_path.read_bytes())
-            rows = []
-            for i, fact in enumerate(facts, start=1):
-                rows.append(
-                    {
-                        "id": i,
-                        "ticker": ticker,
-                        "cik": cik,
-                        "accession": "acc-real",
-                        "period_end": fact.get("period_end"),
-                        "period_type": fact.get("period_type"),
-                        "statement": fact.get("statement"),
-                        "line_item": fact.get("line_item"),
-                        "value": fact.get("value"),
-                        "unit": fact.get("unit"),
-                    }
-                )
-            aggregated = aggregate_canonical_rows(rows)
-            by_statement = {}
-            for row in aggregated:
-                statement = row.get("statement")
-                line_item = row.get("line_item")
-                if statement and line_item:
-                    by_statement.setdefault(statement, set()).add(line_item)
-            for statement, required in required_by_statement.items():
-                missing = required - by_statement.get(statement, set())
-                self.assertFalse(missing, f"{ticker} missing {sorted(missing)} in {statement}")
+        for ticker in REAL_FILING_FIXTURES:
+            with self.subTest(ticker=ticker):
+                # setUpClass already keyed rows by (statement, line_item); probe it rather than rescanning rows.
+                idx = self._sorted_for(ticker)
+                for statement, required in required_by_statement.items():
+                    missing = {line_item for line_item in required if (statement, line_item) not in idx}
+                    self.assertFalse(missing, f"{ticker} missing {sorted(missing)} in {statement}")
 
     def test_regression_coverage_aapl_2023_q2_q3(self) -> None:
         cases = [
             (
-                _resolve_fixture_path("storage/raw/0000320193/000032019323000064_primary.html"),
+                _FIXTURE_PATHS["storage/raw/0000320193/000032019323000064_primary.html"],
                 "2023-04-01",
                 {"income_statement": 16, "balance_sheet": 22, "cash_flow": 16},
                 54,
             ),
             (
-                _resolve_fixture_path("storage/raw/0000320193/000032019323000077_primary.html"),
+                _FIXTURE_PATHS["storage/raw/0000320193/000032019323000077_primary.html"],
                 "2023-07-01",
                 {"income_statement": 16, "balance_sheet": 22, "cash_flow": 17},
                 55,
@@ -955,7 +1061,7 @@ class CanonicalFromRealFilingTests(unittest.TestCase):
             self.assertGreaterEqual(total, total_floor, f"AAPL {period_end} total coverage regression")
 
     def test_regression_coverage_amzn_2023_q2(self) -> None:
-        html_path = _resolve_fixture_path("storage/raw/0001018724/000101872423000012_primary.html")
+        html_path = _FIXTURE_PATHS["storage/raw/0001018724/000101872423000012_primary.html"]
         self.assertTrue(html_path.is_file(), f"Fixture missing: {html_path}")
         counts, total = _coverage_counts(html_path, "2023-06-30", "AMZN", "0001018724")
         floors = {"income_statement": 15, "balance_sheet": 21, "cash_flow": 15}
@@ -968,7 +1074,7 @@ class CanonicalFromRealFilingTests(unittest.TestCase):
         self.assertGreaterEqual(total, 51, "AMZN 2023-06-30 total coverage regression")
 
     def test_regression_coverage_nvda_2023_q1(self) -> None:
-        html_path = _resolve_fixture_path("storage/raw/0001045810/000104581023000093_primary.html")
+        html_path = _FIXTURE_PATHS["storage/raw/0001045810/000104581023000093_primary.html"]
         self.assertTrue(html_path.is_file(), f"Fixture missing: {html_path}")
         counts, total = _coverage_counts(html_path, "2023-04-30", "NVDA", "0001045810")
         floors = {"income_statement": 17, "balance_sheet": 23, "cash_flow": 12}
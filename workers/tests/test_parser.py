@@ -1,7 +1,16 @@
+import hashlib
+import json
+import mmap
+import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
 
-from workers.parser import parse_inline_xbrl
+from workers.parser import parse_and_store, parse_inline_xbrl, parse_inline_xbrl_streaming
 
 
 SAMPLE_INLINE = b"""
@@ -32,6 +41,7 @@ SAMPLE_INLINE = b"""
 </html>
 """
 
+@lru_cache(maxsize=None)
 def _resolve_fixture_path(relative_path: str) -> Path:
     path = Path(relative_path)
     if path.is_file():
@@ -43,9 +53,51 @@ def _resolve_fixture_path(relative_path: str) -> Path:
     return path
 
 
+@contextmanager
+def _mmap_bytes(path: Path) -> Iterator[mmap.mmap]:
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+def _parse_path(path: Path) -> list[dict]:
+    with _mmap_bytes(path) as buf:
+        return parse_inline_xbrl(buf)
+
+
+REAL_FILING_FIXTURES = {
+    "AAPL": "storage/raw/0000320193/000032019325000079_primary.html",
+    "AMZN": "storage/raw/0001018724/000101872425000123_primary.html",
+    "NVDA": "storage/raw/0001045810/000104581025000230_primary.html",
+}
+_PARSED_FACTS: dict[Path, tuple[dict, ...]] = {}
+
+
+def setUpModule() -> None:
+    # Several test classes read the same filings; parse each once up front. Parsing holds the GIL and the
+    # filings share nothing, so do it in separate processes.
+    paths = [path for path in map(_resolve_fixture_path, REAL_FILING_FIXTURES.values()) if path.is_file()]
+    if not paths:
+        return
+    with ProcessPoolExecutor(max_workers=len(paths)) as pool:
+        for path, facts in zip(paths, pool.map(_parse_path, paths)):
+            _PARSED_FACTS[path] = tuple(facts)
+
+
+def _parsed_facts(path: Path) -> tuple[dict, ...]:
+    """Parsed facts for a fixture, shared read-only across tests in this module."""
+    facts = _PARSED_FACTS.get(path)
+    if facts is None:
+        facts = _PARSED_FACTS[path] = tuple(_parse_path(path))
+    return facts
+
+
 class ParseInlineXBRLTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.sample_facts = parse_inline_xbrl(SAMPLE_INLINE)
+
     def test_extracts_target_facts_with_contexts_and_units(self) -> None:
-        facts = parse_inline_xbrl(SAMPLE_INLINE)
+        facts = self.sample_facts
         self.assertEqual(len(facts), 4)
 
         revenue = next(f for f in facts if f["line_item"] == "revenue")
@@ -68,6 +120,21 @@ class ParseInlineXBRLTests(unittest.TestCase):
         self.assertEqual(shares["period_type"], "duration")
         self.assertEqual(shares["value"], 50.0)
 
+    def test_empty_input_yields_no_facts(self) -> None:
+        self.assertEqual(parse_inline_xbrl(b""), [])
+
+    def test_recovers_from_stray_close_tags(self) -> None:
+        facts = parse_inline_xbrl(SAMPLE_INLINE.replace(b"<body>", b"<body></div></span>"))
+        self.assertEqual(facts, self.sample_facts)
+
+    def test_recovers_from_script_bodies_with_markup_characters(self) -> None:
+        script = b"<script>if (a < b && c > 0) { document.write('<p>'); }</script>"
+        facts = parse_inline_xbrl(SAMPLE_INLINE.replace(b"<body>", b"<body>" + script))
+        self.assertEqual(facts, self.sample_facts)
+
+    def test_reads_facts_from_concatenated_documents(self) -> None:
+        self.assertEqual(len(parse_inline_xbrl(SAMPLE_INLINE + SAMPLE_INLINE)), 8)
+
     def test_respects_ix_sign_attribute(self) -> None:
         sample = b"""
         <html>
@@ -123,7 +190,7 @@ class ParseRealFilingTests(unittest.TestCase):
     def test_parses_real_primary_html(self) -> None:
         html_path = _resolve_fixture_path("storage/raw/0001045810/000104581025000230_primary.html")
         self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-        facts = parse_inline_xbrl(html_path.read_bytes())
+        facts = _parsed_facts(html_path)
 
         def find_line(line_item: str) -> dict:
             return next(f for f in facts if f["line_item"] == line_item)
@@ -152,7 +219,7 @@ class ParseRealFilingTests(unittest.TestCase):
     def test_parses_second_real_filing(self) -> None:
         html_path = _resolve_fixture_path("storage/raw/0001018724/000101872425000123_primary.html")
         self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-        facts = parse_inline_xbrl(html_path.read_bytes())
+        facts = _parsed_facts(html_path)
         def find_line(line_item: str) -> dict:
             return next(f for f in facts if f["line_item"] == line_item)
 
@@ -167,7 +234,7 @@ class ParseRealFilingTests(unittest.TestCase):
     def test_parses_third_real_filing(self) -> None:
         html_path = _resolve_fixture_path("storage/raw/0000320193/000032019325000079_primary.html")
         self.assertTrue(html_path.is_file(), "Real filing fixture missing")
-        facts = parse_inline_xbrl(html_path.read_bytes())
+        facts = _parsed_facts(html_path)
         revenue_values = [f["value"] for f in facts if f["line_item"] == "revenue"]
         net_income_values = [f["value"] for f in facts if f["line_item"] == "net_income"]
         assets_values = [(f["value"], f["period_type"]) for f in facts if f["line_item"] == "assets"]
@@ -185,7 +252,7 @@ class ParseRealFilingTests(unittest.TestCase):
     def test_prefers_cumulative_spans_for_quarterly_filings(self) -> None:
         aapl_path = _resolve_fixture_path("storage/raw/0000320193/000032019323000077_primary.html")
         self.assertTrue(aapl_path.is_file(), "Real filing fixture missing")
-        aapl_facts = parse_inline_xbrl(aapl_path.read_bytes())
+        aapl_facts = _parsed_facts(aapl_path)
         aapl_starts = {
             f["period_start"]
             for f in aapl_facts
@@ -195,7 +262,7 @@ class ParseRealFilingTests(unittest.TestCase):
 
         amzn_path = _resolve_fixture_path("storage/raw/0001018724/000101872423000012_primary.html")
         self.assertTrue(amzn_path.is_file(), "Real filing fixture missing")
-        amzn_facts = parse_inline_xbrl(amzn_path.read_bytes())
+        amzn_facts = _parsed_facts(amzn_path)
         amzn_starts = {
             f["period_start"]
             for f in amzn_facts
@@ -224,15 +291,10 @@ class ParseStatementParityTests(unittest.TestCase):
             self.assertIn(required, line_items, f"{ticker} missing cash flow core line item: {required}")
 
     def test_statement_core_line_items_for_fixtures(self) -> None:
-        fixtures = {
-            "AAPL": _resolve_fixture_path("storage/raw/0000320193/000032019325000079_primary.html"),
-            "AMZN": _resolve_fixture_path("storage/raw/0001018724/000101872425000123_primary.html"),
-            "NVDA": _resolve_fixture_path("storage/raw/0001045810/000104581025000230_primary.html"),
-        }
-        for ticker, path in fixtures.items():
+        for ticker, relative_path in REAL_FILING_FIXTURES.items():
+            path = _resolve_fixture_path(relative_path)
             self.assertTrue(path.is_file(), f"Fixture missing for {ticker}: {path}")
-            facts = parse_inline_xbrl(path.read_bytes())
-            self._assert_core_line_items(facts, ticker)
+            self._assert_core_line_items(_parsed_facts(path), ticker)
 
 
 class ParseContextsWithSegmentsTests(unittest.TestCase):
@@ -292,5 +354,113 @@ class ParseContextsWithSegmentsTests(unittest.TestCase):
         self.assertEqual(len(cash), 1, "Only consolidated cash context should remain")
         self.assertEqual(cash[0]["value"], 75.0)
 
+
+# Golden parses captured from the BeautifulSoup parser before parse_inline_xbrl moved onto the streaming path:
+# (fact count, sha1 of the facts serialized as sorted-key JSON) for the newest filing of each stored company.
+STORED_FILING_GOLDENS = {
+    "storage/raw/0000040545/000004054525000132_primary.html": (199, "97a5f17c6559876c6ec90f9115f9c74946da48e5"),
+    "storage/raw/0000320193/000032019325000079_primary.html": (274, "625cf8f68a5a8bd6f1142f3e83c36e9aba4d9b59"),
+    "storage/raw/0001018724/000101872425000123_primary.html": (202, "cfce04ef840c433ad3fc94669ee96daaf0f478ae"),
+    "storage/raw/0001045810/000104581025000230_primary.html": (220, "ae27d8a3f2c607ede126850d6ecd153614a96828"),
+    "storage/raw/0001318605/000162828025045968_primary.html": (193, "477bbec5a09101c9abd98c67c7f44ac6e13e7b84"),
+    "storage/raw/0001341439/000119312525315925_primary.html": (168, "862d04b56d3deb8ae25e74e15238d8ee6d5d7337"),
+}
+
+
+def _facts_digest(facts) -> str:
+    return hashlib.sha1(json.dumps(list(facts), sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ParseInlineXBRLGoldenTests(unittest.TestCase):
+    def test_sample_from_path_matches_golden_facts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "sample.html"
+            path.write_bytes(SAMPLE_INLINE)
+            facts = parse_inline_xbrl_streaming(str(path))
+
+        self.assertEqual(len(facts), 4)
+        by_item = {f["line_item"]: f for f in facts}
+        self.assertEqual(
+            by_item["revenue"],
+            {
+                "line_item": "revenue",
+                "statement": "income_statement",
+                "value": 9000.0,
+                "unit": "USD",
+                "xbrl_tag": "us-gaap:Revenues",
+                "context_ref": "D2023Q2",
+                "period_start": "2023-03-27",
+                "period_end": "2023-06-24",
+                "period_type": "duration",
+            },
+        )
+        self.assertEqual((by_item["assets"]["value"], by_item["assets"]["context_ref"]), (100000.0, "I2023"))
+        self.assertEqual(by_item["assets"]["period_type"], "instant")
+        self.assertEqual(by_item["shares_diluted"]["unit"], "SHARES")
+
+    def test_real_filing_matches_golden_facts(self) -> None:
+        html_path = _resolve_fixture_path("storage/raw/0001045810/000104581025000230_primary.html")
+        self.assertTrue(html_path.is_file(), "Real filing fixture missing")
+        facts = _parsed_facts(html_path)
+
+        self.assertEqual(len(facts), 220)
+        keyed = {(f["line_item"], f["context_ref"]): f for f in facts}
+        revenue = keyed[("revenue", "c-1")]
+        self.assertEqual(revenue["value"], 147811000000.0)
+        self.assertEqual((revenue["period_start"], revenue["period_end"]), ("2025-01-27", "2025-10-26"))
+        self.assertEqual(keyed[("revenue", "c-5")]["value"], 91166000000.0)
+        self.assertEqual(keyed[("assets", "c-6")]["value"], 161148000000.0)
+        self.assertEqual(keyed[("assets", "c-6")]["period_type"], "instant")
+        eps = keyed[("eps_diluted", "c-1")]
+        self.assertEqual((eps["value"], eps["unit"]), (3.14, "USDPERSHARE"))
+
+    def test_stored_filings_match_golden_digests(self) -> None:
+        for relative_path, (count, digest) in STORED_FILING_GOLDENS.items():
+            html_path = _resolve_fixture_path(relative_path)
+            if not html_path.is_file():
+                continue
+            with self.subTest(path=relative_path):
+                facts = _parsed_facts(html_path)
+                self.assertEqual(len(facts), count)
+                self.assertEqual(_facts_digest(facts), digest)
+
+
+
+class ParseAndStoreTests(unittest.TestCase):
+    def test_counts_facts_without_a_value_as_dropped(self) -> None:
+        blank = b'<ix:nonfraction name="us-gaap:CostOfRevenue" contextref="D2023Q2" unitref="usd">-</ix:nonfraction>'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "filing.html"
+            path.write_bytes(SAMPLE_INLINE.replace(b"</body>", blank + b"</body>"))
+            with patch("workers.parser._purge_existing_facts") as purge, patch("workers.parser.persist_fact") as persist:
+                result = parse_and_store("acc-1", "0000000000", "test", str(path))
+
+        self.assertEqual(result, {"inserted": 4, "dropped": 1})
+        purge.assert_called_once_with("acc-1", "TEST")
+        self.assertEqual(persist.call_count, 4)
+
+    def test_empty_file_stores_no_facts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "empty.html"
+            path.write_bytes(b"")
+            with patch("workers.parser._purge_existing_facts") as purge, patch("workers.parser.persist_fact") as persist:
+                result = parse_and_store("acc-1", "0000000000", "test", str(path))
+
+        self.assertEqual(result, {"inserted": 0, "dropped": 0})
+        purge.assert_not_called()
+        persist.assert_not_called()
+
+    def test_parse_errors_store_no_facts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "filing.html"
+            path.write_bytes(SAMPLE_INLINE)
+            with patch("workers.parser.parse_inline_xbrl_streaming", side_effect=OSError("truncated")), patch(
+                "workers.parser._purge_existing_facts"
+            ) as purge, self.assertLogs("workers.parser", level="ERROR"):
+                result = parse_and_store("acc-1", "0000000000", "test", str(path))
+
+        self.assertEqual(result, {"inserted": 0, "dropped": 0})
+        purge.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from workers import statements
+from workers.statements import build_statements
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConn", name: object) -> None:
+        self._conn = conn
+        self._name = name
+        self.itersize = None
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def execute(self, sql: str, params: object = None, binary: bool = False) -> None:
+        if self._name is not None:
+            self._conn.row_queries += 1
+            self._conn.row_params = params
+
+    def __iter__(self):
+        return iter(self._conn.rows)
+
+
+class _FakeConn:
+    """Stands in for a psycopg connection: rows come back already in the SQL's period_end DESC order."""
+
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+        self.row_queries = 0
+        self.row_params: object = None
+
+    def __enter__(self) -> "_FakeConn":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def cursor(self, name: object = None, row_factory: object = None) -> _FakeCursor:
+        return _FakeCursor(self, name)
+
+
+_ROWS = [
+    (date(2023, 9, 30), "balance_sheet", "assets", 500.0, "USD"),
+    (date(2023, 9, 30), "income_statement", "custom_metric", 7.0, "USD"),
+    (date(2023, 9, 30), "income_statement", "net_income", 20.0, "USD"),
+    (date(2023, 9, 30), "income_statement", "revenue", 100.0, "USD"),
+    (date(2023, 6, 30), None, None, None, None),
+    (date(2023, 3, 31), "income_statement", "revenue", 90.0, "USD"),
+]
+
+
+class BuildStatementsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = _FakeConn(list(_ROWS))
+        patcher = patch.multiple(statements, ensure_schema=lambda: None, get_conn=lambda: self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_groups_periods_in_display_order(self) -> None:
+        periods = build_statements("aapl")["periods"]
+
+        self.assertEqual([p["period_end"] for p in periods], ["2023-09-30", "2023-06-30", "2023-03-31"])
+        income = periods[0]["lines"]["income_statement"]
+        # Display order first; items outside STATEMENT_DISPLAY_ORDER go last.
+        self.assertEqual([line["line_item"] for line in income], ["revenue", "net_income", "custom_metric"])
+        self.assertEqual(income[0], {"line_item": "revenue", "value": 100.0, "unit": "USD"})
+        self.assertEqual(periods[0]["lines"]["balance_sheet"], [{"line_item": "assets", "value": 500.0, "unit": "USD"}])
+
+    def test_keeps_periods_whose_rows_have_no_statement(self) -> None:
+        periods = build_statements("aapl")["periods"]
+        self.assertEqual(periods[1], {"period_end": "2023-06-30", "lines": {}})
+
+    def test_truncates_to_max_periods(self) -> None:
+        periods = build_statements("aapl", max_periods=2)["periods"]
+        self.assertEqual([p["period_end"] for p in periods], ["2023-09-30", "2023-06-30"])
+
+    def test_negative_max_periods_selects_no_periods(self) -> None:
+        self.conn.rows = []  # what LIMIT 0 returns
+        self.assertEqual(build_statements("aapl", max_periods=-1), {"periods": []})
+        self.assertEqual(self.conn.row_params, ("AAPL", 0, "AAPL"))
+
+    def test_each_call_reads_current_rows(self) -> None:
+        build_statements("aapl")["periods"][0]["lines"]["income_statement"][0]["value"] = -1.0
+        self.conn.rows[3] = (date(2023, 9, 30), "income_statement", "revenue", 110.0, "USD")
+
+        periods = build_statements("aapl")["periods"]
+        self.assertEqual(self.conn.row_queries, 2)
+        self.assertEqual(periods[0]["lines"]["income_statement"][0]["value"], 110.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
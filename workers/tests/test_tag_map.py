@@ -43,8 +43,9 @@ class TagMapTests(unittest.TestCase):
             "us-gaap:IncreaseDecreaseInAccountsPayable",
             "us-gaap:TreasuryStockCommonValue",
         ]
-        for tag in expected:
-            self.assertIn(tag, TAG_MAP)
+        # One set difference reports every missing tag at once instead of stopping at the first.
+        missing = set(expected) - TAG_MAP.keys()
+        self.assertFalse(missing, f"TAG_MAP missing {sorted(missing)}")
 
 
 if __name__ == "__main__":
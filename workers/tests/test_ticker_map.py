@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import unittest
+import urllib.error
+from pathlib import Path
+from unittest.mock import patch
+
+from workers import ticker_map
+
+
+def _response(payload: bytes) -> io.BytesIO:
+    return io.BytesIO(payload)
+
+
+class SecTickerDownloadTests(unittest.TestCase):
+    PAYLOAD = json.dumps({"0": {"cik_str": 320193, "ticker": "aapl", "title": "Apple Inc."}}).encode()
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.target = self.dir / "company_tickers.json"
+
+    def _download(self, **urlopen: object):
+        with patch("urllib.request.urlopen", **urlopen):
+            return ticker_map._download_sec_tickers(str(self.target))
+
+    def test_success_writes_payload_with_umask_mode(self) -> None:
+        previous = os.umask(0o027)
+        try:
+            mapping = self._download(return_value=_response(self.PAYLOAD))
+        finally:
+            os.umask(previous)
+
+        self.assertEqual(mapping, {"AAPL": "0000320193"})
+        self.assertEqual(self.target.read_bytes(), self.PAYLOAD)
+        self.assertEqual(stat.S_IMODE(self.target.stat().st_mode), 0o640)
+        self.assertEqual(os.listdir(self.dir), [self.target.name])
+
+    def test_invalid_json_keeps_existing_file_and_removes_temp(self) -> None:
+        self.target.write_text('{"old": true}')
+        self.assertIsNone(self._download(return_value=_response(b"<html>rate limited</html>")))
+        self.assertEqual(self.target.read_text(), '{"old": true}')
+        self.assertEqual(os.listdir(self.dir), [self.target.name])
+
+    def test_http_error_returns_none(self) -> None:
+        error = urllib.error.HTTPError("https://www.sec.gov/files/company_tickers.json", 403, "Forbidden", {}, None)
+        self.assertIsNone(self._download(side_effect=error))
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+    def test_success_fsyncs_the_target_directory(self) -> None:
+        synced = []
+        real_fsync = os.fsync
+
+        def recording_fsync(fd: int) -> None:
+            synced.append(stat.S_ISDIR(os.fstat(fd).st_mode))
+            real_fsync(fd)
+
+        with patch("os.fsync", side_effect=recording_fsync):
+            self.assertIsNotNone(self._download(return_value=_response(self.PAYLOAD)))
+        # The temp file first, then the directory holding the renamed entry.
+        self.assertEqual(synced, [False, True])
+
+    def test_directory_fsync_failure_keeps_the_download(self) -> None:
+        real_open = os.open
+
+        def failing_open(path, flags, *args):
+            if os.path.isdir(path):
+                raise OSError("EACCES")
+            return real_open(path, flags, *args)
+
+        with patch("os.open", side_effect=failing_open), self.assertLogs(ticker_map.__name__, level="WARNING"):
+            mapping = self._download(return_value=_response(self.PAYLOAD))
+
+        self.assertEqual(mapping, {"AAPL": "0000320193"})
+        self.assertEqual(self.target.read_bytes(), self.PAYLOAD)
+        self.assertEqual(os.listdir(self.dir), [self.target.name])
+
+class CuratedMapCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.primary = Path(tmp.name) / "primary.csv"
+        self.fallback = Path(tmp.name) / "fallback.csv"
+        for target, value in (
+            ("DEFAULT_PATHS", (str(self.primary), str(self.fallback))),
+            ("_CACHE", ({}, None, None)),
+        ):
+            patcher = patch.object(ticker_map, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(ticker_map, "_load_sec_map", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fresh_cache_skips_the_path_walk(self) -> None:
+        self.primary.write_text("ticker,cik\naapl,0000320193\n")
+        first = ticker_map._load_map()
+        with patch("os.path.isfile") as isfile:
+            second = ticker_map._load_map()
+
+        isfile.assert_not_called()
+        self.assertIs(second, first)
+        self.assertEqual(second, {"AAPL": "0000320193"})
+
+    def test_reloads_when_the_file_mtime_changes(self) -> None:
+        self.primary.write_text("ticker,cik\naapl,0000320193\n")
+        ticker_map._load_map()
+        self.primary.write_text("ticker,cik\nmsft,0000789019\n")
+        mtime = self.primary.stat().st_mtime
+        os.utime(self.primary, (mtime + 10, mtime + 10))
+
+        self.assertEqual(ticker_map._load_map(), {"MSFT": "0000789019"})
+
+    def test_reloads_from_the_next_path_when_the_cached_file_goes_away(self) -> None:
+        self.primary.write_text("ticker,cik\naapl,0000320193\n")
+        ticker_map._load_map()
+        self.primary.unlink()
+        self.fallback.write_text("ticker,cik\nnvda,0001045810\n")
+
+        self.assertEqual(ticker_map._load_map(), {"NVDA": "0001045810"})
+        self.assertEqual(ticker_map._CACHE[2], str(self.fallback))
+
+
+    def test_reads_columns_by_header_name(self) -> None:
+        self.primary.write_text("cik,ticker\n0000320193,aapl\n")
+        self.assertEqual(ticker_map._load_map(), {"AAPL": "0000320193"})
+
+    def test_skips_blank_lines(self) -> None:
+        self.primary.write_text("ticker,cik\n\naapl,0000320193\n\nmsft,0000789019\n")
+        self.assertEqual(ticker_map._load_map(), {"AAPL": "0000320193", "MSFT": "0000789019"})
+
+    def test_missing_column_raises(self) -> None:
+        self.primary.write_text("symbol,cik\naapl,0000320193\n")
+        with self.assertRaises(ValueError):
+            ticker_map._load_map()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 import csv
 import json
 import os
+import shutil
+import tempfile
+import urllib.request
 from typing import Dict, Optional, Tuple
 
 DEFAULT_PATHS = (
@@ -23,8 +26,46 @@ SEC_DOWNLOAD_TARGETS = (
     "/data/company_tickers.json",
 )
 
-_CACHE: Tuple[Dict[str, str], Optional[float]] = ({}, None)
-_SEC_CACHE: Tuple[Dict[str, str], Optional[float]] = ({}, None)
+_CACHE: Tuple[Dict[str, str], Optional[float], Optional[str]] = ({}, None, None)
+_SEC_CACHE: Tuple[Dict[str, str], Optional[float], Optional[str]] = ({}, None, None)
+
+
+def _cached_if_fresh(cache: Tuple[Dict[str, str], Optional[float], Optional[str]]) -> Optional[Dict[str, str]]:
+    """Return the cached map when the file it was loaded from is unchanged; one stat, no path walk."""
+    mapping, mtime, path = cache
+    if not mapping or mtime is None or not path:
+        return None
+    try:
+        if os.stat(path).st_mtime == mtime:
+            return mapping
+    except OSError:
+        pass
+    return None
+
+
+def _sec_mapping(data: Dict[str, Dict]) -> Dict[str, str]:
+    """Build ticker → zero-padded CIK from the SEC payload, which is keyed by index with ticker + cik_str entries."""
+    mapping: Dict[str, str] = {}
+    for entry in data.values():
+        ticker = entry.get("ticker")
+        cik = entry.get("cik_str") or entry.get("cik")
+        if ticker and cik is not None:
+            mapping[ticker.strip().upper()] = f"{int(cik):010d}"
+    return mapping
+
+
+def _fsync_directory(path: str) -> None:
+    """Sync a directory so a rename into it survives a crash; the file is already in place either way."""
+    try:
+        dir_fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError as exc:
+        import logging
+
+        logging.getLogger(__name__).warning("Could not fsync %s after replacing SEC tickers: %s", path, exc)
 
 
 def _download_sec_tickers(target_path: str) -> Optional[Dict[str, str]]:
@@ -32,35 +73,44 @@ def _download_sec_tickers(target_path: str) -> Optional[Dict[str, str]]:
     Fetch the SEC company_tickers.json when it is missing (common when the data/ volume
     is not mounted into the container) and persist it for subsequent runs.
     """
+    request = urllib.request.Request(
+        "https://www.sec.gov/files/company_tickers.json",
+        headers={"User-Agent": os.getenv("EDGAR_USER_AGENT", "deltaisland-research/0.1 (contact@deltaisland.local)")},
+    )
+    tmp_path: Optional[str] = None
     try:
-        import requests
-    except ImportError:
-        return None
-
-    try:
-        resp = requests.get(
-            "https://www.sec.gov/files/company_tickers.json",
-            headers={"User-Agent": os.getenv("EDGAR_USER_AGENT", "deltaisland-research/0.1 (contact@deltaisland.local)")},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        os.makedirs(os.path.dirname(target_path), exist_ok=True)
-        with open(target_path, "w") as f:
-            json.dump(data, f)
-        mapping: Dict[str, str] = {}
-        for entry in data.values():
-            ticker = entry.get("ticker")
-            cik = entry.get("cik_str") or entry.get("cik")
-            if not ticker or cik is None:
-                continue
-            mapping[ticker.strip().upper()] = f"{int(cik):010d}"
-        return mapping
+        target_dir = os.path.dirname(target_path)
+        os.makedirs(target_dir, exist_ok=True)
+        # Each writer gets its own temp file: parallel backfill workers can all miss the cache and download at once.
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=f"{os.path.basename(target_path)}.", suffix=".tmp")
+        # Stream the payload straight to disk and parse it from there, so it is never held twice in memory.
+        with os.fdopen(fd, "wb") as f, urllib.request.urlopen(request, timeout=30) as resp:
+            # mkstemp creates 0600; apply the umask the way a plain open() would.
+            umask = os.umask(0)
+            os.umask(umask)
+            os.fchmod(f.fileno(), 0o666 & ~umask)
+            shutil.copyfileobj(resp, f, length=1 << 20)
+            # Flush to disk before the rename so a crash never leaves a truncated file under the final name.
+            f.flush()
+            os.fsync(f.fileno())
+        with open(tmp_path, "rb") as f:
+            data = json.load(f)
+        os.replace(tmp_path, target_path)
+        _fsync_directory(target_dir or ".")
+        return _sec_mapping(data)
     except Exception:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
         return None
 
 def _load_map() -> Dict[str, str]:
     global _CACHE
+    cached = _cached_if_fresh(_CACHE)
+    if cached is not None:
+        return cached
     attempted = []
     for path in DEFAULT_PATHS:
         if not path:
@@ -72,19 +122,19 @@ def _load_map() -> Dict[str, str]:
             except OSError:
                 mtime = None
 
-            cached_map, cached_mtime = _CACHE
-            if cached_map and mtime is not None and mtime == cached_mtime:
-                return cached_map
-
             mapping: Dict[str, str] = {}
             with open(path, newline="") as f:
-                reader = csv.DictReader(f)
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    continue
+                ticker_idx, cik_idx = header.index("ticker"), header.index("cik")
                 for row in reader:
-                    ticker = row["ticker"].strip().upper()
-                    cik = row["cik"].strip()
-                    mapping[ticker] = cik
+                    if not row:
+                        continue  # DictReader skipped blank lines; keep doing so.
+                    mapping[row[ticker_idx].strip().upper()] = row[cik_idx].strip()
             if mapping:
-                _CACHE = (mapping, mtime)
+                _CACHE = (mapping, mtime, path)
                 return mapping
     # If nothing was loaded, try the SEC map as a last-resort source for curated tickers too.
     sec = _load_sec_map()
@@ -101,6 +151,9 @@ def _load_map() -> Dict[str, str]:
 def _load_sec_map() -> Dict[str, str]:
     """Load the full SEC ticker → CIK dataset if present."""
     global _SEC_CACHE
+    cached = _cached_if_fresh(_SEC_CACHE)
+    if cached is not None:
+        return cached
     attempted = []
     for path in SEC_TICKER_PATHS:
         if not path or not os.path.isfile(path):
@@ -111,24 +164,11 @@ def _load_sec_map() -> Dict[str, str]:
         except OSError:
             mtime = None
 
-        cached_map, cached_mtime = _SEC_CACHE
-        if cached_map and mtime is not None and mtime == cached_mtime:
-            return cached_map
-
-        with open(path) as f:
-            data = json.load(f)
-
-        mapping: Dict[str, str] = {}
-        # SEC JSON is keyed by index; each entry has ticker + cik_str.
-        for entry in data.values():
-            ticker = entry.get("ticker")
-            cik = entry.get("cik_str") or entry.get("cik")
-            if not ticker or cik is None:
-                continue
-            mapping[ticker.strip().upper()] = f"{int(cik):010d}"
+        with open(path, "rb") as f:
+            mapping = _sec_mapping(json.load(f))
 
         if mapping:
-            _SEC_CACHE = (mapping, mtime)
+            _SEC_CACHE = (mapping, mtime, path)
             return mapping
     # If nothing is present locally, try to fetch and persist once or when cache is empty.
     for target in SEC_DOWNLOAD_TARGETS:
@@ -136,7 +176,7 @@ def _load_sec_map() -> Dict[str, str]:
             continue
         downloaded = _download_sec_tickers(target)
         if downloaded:
-            _SEC_CACHE = (downloaded, os.path.getmtime(target) if os.path.isfile(target) else None)
+            _SEC_CACHE = (downloaded, os.path.getmtime(target) if os.path.isfile(target) else None, target)
             return downloaded
     if attempted:
         import logging